@@ -0,0 +1,252 @@
+"""N-player Snake arena on a large grid.
+
+Every cell of the board lives in one flat occupancy array (0 = empty,
+FOOD, or snake id + 1), so a move is checked against all snakes with a single
+lookup and a tick costs O(number of snakes) regardless of how long they
+are. Viewport snapshots read the same array, so their cost depends on the
+viewport area rather than on the total body length.
+"""
+import random
+from array import array
+from collections import deque
+
+from sim_core import DIRECTIONS, OPPOSITE
+
+EMPTY = 0
+FOOD = 0xFFFF
+MAX_SNAKES = FOOD - 1
+
+TURNS = {"up": ("left", "right"), "down": ("right", "left"),
+         "left": ("down", "up"), "right": ("up", "down")}
+
+
+class ArenaSnake:
+    __slots__ = ("snake_id", "name", "body", "direction", "alive", "score", "is_bot")
+
+    def __init__(self, snake_id, name, body, direction, is_bot):
+        self.snake_id = snake_id
+        self.name = name
+        # Flat cell indices, head first
+        self.body = body
+        self.direction = direction
+        self.alive = True
+        self.score = 0
+        self.is_bot = is_bot
+
+    @property
+    def head(self):
+        return self.body[0]
+
+
+class SnakeArena:
+    """Authoritative state for any number of snakes and food items"""
+    def __init__(self, width=500, height=500, food_count=None, seed=None):
+        self.width = width
+        self.height = height
+        self.grid = array("H", [EMPTY]) * (width * height)
+        self.snakes = {}
+        self.food = set()
+        self.food_count = food_count if food_count is not None else max(10, width * height // 2500)
+        self.random = random.Random(seed)
+        self.next_id = 0
+        self.tick = 0
+        self.top_up_food()
+
+    def cell(self, x, y):
+        return y * self.width + x
+
+    def position(self, index):
+        return index % self.width, index // self.width
+
+    def add_snake(self, name=None, length=3, is_bot=False):
+        """Drop a new snake on a free horizontal run; returns its id"""
+        if self.next_id >= MAX_SNAKES:
+            raise ValueError("Arena is full")
+        snake_id = self.next_id
+        self.next_id += 1
+        return self._place(snake_id, name or f"Snake {snake_id}", length, is_bot)
+
+    def respawn(self, snake_id, length=3):
+        """Start a dead snake over somewhere else, keeping its id and name"""
+        old = self.snakes.pop(snake_id)
+        self._clear(old)
+        return self._place(snake_id, old.name, length, old.is_bot)
+
+    def _place(self, snake_id, name, length, is_bot):
+        body = self._free_run(length)
+        direction = self.random.choice(("left", "right"))
+        # The head leads in the direction of travel
+        if direction == "left":
+            body.reverse()
+        snake = ArenaSnake(snake_id, name, deque(body), direction, is_bot)
+        for index in snake.body:
+            self.grid[index] = snake_id + 1
+        self.snakes[snake_id] = snake
+        return snake_id
+
+    def remove_snake(self, snake_id):
+        snake = self.snakes.pop(snake_id, None)
+        if snake:
+            self._clear(snake)
+
+    def _free_run(self, length):
+        for _ in range(10000):
+            x = self.random.randrange(1, self.width - length - 1)
+            y = self.random.randrange(1, self.height - 1)
+            start = self.cell(x, y)
+            cells = list(range(start + length - 1, start - 1, -1))
+            # Leave a cell of margin ahead of both ends
+            margin = (start - 1, start + length)
+            if all(self.grid[c] == EMPTY for c in cells + list(margin)):
+                return cells
+        raise ValueError("No free space for a new snake")
+
+    def _clear(self, snake):
+        marker = snake.snake_id + 1
+        for index in snake.body:
+            if self.grid[index] == marker:
+                self.grid[index] = EMPTY
+
+    def steer(self, snake_id, direction):
+        snake = self.snakes.get(snake_id)
+        if snake and direction in DIRECTIONS and direction != OPPOSITE[snake.direction]:
+            snake.direction = direction
+            return True
+        return False
+
+    def autopilot(self, snake):
+        """Cheap bot steering: grab adjacent food, avoid walls and bodies, mostly go straight"""
+        x, y = self.position(snake.head)
+        safe = []
+        for direction in (snake.direction,) + TURNS[snake.direction]:
+            dx, dy = DIRECTIONS[direction]
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                occupant = self.grid[self.cell(nx, ny)]
+                if occupant == FOOD:
+                    snake.direction = direction
+                    return
+                if occupant == EMPTY:
+                    safe.append(direction)
+
+        if not safe:
+            return
+        if safe[0] == snake.direction and self.random.random() < 0.9:
+            return
+        snake.direction = self.random.choice(safe)
+
+    def step(self):
+        """Advance every snake one cell; returns ids of snakes that died"""
+        self.tick += 1
+        grid = self.grid
+        width, height = self.width, self.height
+
+        # Pass 1: where does every head want to go?
+        targets = {}
+        head_counts = {}
+        dead = set()
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            if snake.is_bot:
+                self.autopilot(snake)
+            dx, dy = DIRECTIONS[snake.direction]
+            x, y = snake.head % width + dx, snake.head // width + dy
+            if not (0 <= x < width and 0 <= y < height):
+                dead.add(snake.snake_id)
+                continue
+            target = y * width + x
+            targets[snake.snake_id] = target
+            head_counts[target] = head_counts.get(target, 0) + 1
+
+        # Tails that move out of the way this tick don't block anyone
+        eating = {snake_id for snake_id, target in targets.items() if target in self.food}
+        vacating = {self.snakes[snake_id].body[-1] for snake_id in targets if snake_id not in eating}
+
+        # Pass 2: head-vs-head and head-vs-body via the occupancy grid
+        for snake_id, target in targets.items():
+            if head_counts[target] > 1:
+                dead.add(snake_id)
+                continue
+            occupant = grid[target]
+            if occupant != EMPTY and occupant != FOOD and target not in vacating:
+                dead.add(snake_id)
+
+        # Apply: free tails first so heads moving into them aren't erased
+        movers = [snake_id for snake_id in targets if snake_id not in dead]
+        for snake_id in movers:
+            if snake_id not in eating:
+                snake = self.snakes[snake_id]
+                tail = snake.body.pop()
+                if grid[tail] == snake_id + 1:
+                    grid[tail] = EMPTY
+        for snake_id in movers:
+            snake = self.snakes[snake_id]
+            target = targets[snake_id]
+            if snake_id in eating:
+                self.food.discard(target)
+                snake.score += 1
+            grid[target] = snake_id + 1
+            snake.body.appendleft(target)
+
+        for snake_id in dead:
+            snake = self.snakes[snake_id]
+            snake.alive = False
+            self._clear(snake)
+            # Part of the corpse becomes food for the survivors
+            for index in list(snake.body)[::3]:
+                if grid[index] == EMPTY:
+                    grid[index] = FOOD
+                    self.food.add(index)
+
+        self.top_up_food()
+        return dead
+
+    def top_up_food(self):
+        free_cells = self.width * self.height
+        attempts = 0
+        while len(self.food) < self.food_count and attempts < self.food_count * 4 and free_cells:
+            attempts += 1
+            index = self.random.randrange(free_cells)
+            if self.grid[index] == EMPTY:
+                self.grid[index] = FOOD
+                self.food.add(index)
+
+    def viewport_origin(self, snake_id, view_width, view_height):
+        """Top-left cell of a view centred on the snake's head, clamped to the board"""
+        snake = self.snakes.get(snake_id)
+        x, y = self.position(snake.head) if snake else (self.width // 2, self.height // 2)
+        x0 = min(max(0, x - view_width // 2), max(0, self.width - view_width))
+        y0 = min(max(0, y - view_height // 2), max(0, self.height - view_height))
+        return x0, y0
+
+    def view(self, snake_id, view_width, view_height):
+        """Snapshot culled to one player's viewport, ready to send as JSON.
+
+        ``cells`` is a flat [dx, dy, occupant, ...] list relative to the
+        viewport origin; occupant is FOOD or snake id + 1.
+        """
+        x0, y0 = self.viewport_origin(snake_id, view_width, view_height)
+        grid = self.grid
+        cells = []
+        for dy in range(min(view_height, self.height - y0)):
+            row_start = (y0 + dy) * self.width + x0
+            row = grid[row_start:row_start + min(view_width, self.width - x0)]
+            if not any(row):
+                continue
+            for dx, occupant in enumerate(row):
+                if occupant:
+                    cells.extend((dx, dy, occupant))
+
+        snake = self.snakes.get(snake_id)
+        leaders = sorted(self.snakes.values(), key=lambda s: s.score, reverse=True)[:5]
+        return {
+            "tick": self.tick,
+            "view": [x0, y0, view_width, view_height],
+            "board": [self.width, self.height],
+            "cells": cells,
+            "you": snake_id + 1,
+            "alive": bool(snake and snake.alive),
+            "score": snake.score if snake else 0,
+            "leaders": [[s.name, s.score] for s in leaders]
+        }
@@ -0,0 +1,38 @@
+import importlib
+import threading
+
+import pygame
+
+_fonts = {}
+# FreeType face creation isn't thread-safe; rendering an existing font is
+_font_lock = threading.Lock()
+
+
+def get_font(size):
+    """Default font at the given size, loaded on first use and cached"""
+    font = _fonts.get(size)
+    if font is None:
+        with _font_lock:
+            font = _fonts.get(size)
+            if font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+
+def prewarm(font_sizes=(), modules=()):
+    """Load fonts and import modules on a background thread ahead of first use"""
+    def work():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                # Surfaced again, with a traceback, when the game is started
+                pass
+        for size in font_sizes:
+            get_font(size)
+
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    return thread
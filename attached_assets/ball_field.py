@@ -0,0 +1,122 @@
+"""Vectorized physics for hundreds of Pong balls at once.
+
+Positions and velocities live in NumPy arrays and every rule (walls,
+paddles, scoring) is a handful of whole-array operations, so a tick costs
+about the same for 10 balls as for 1000. Paddle hits are swept: a ball
+whose path crossed a paddle face during the tick bounces even if it
+started and ended on opposite sides of the paddle.
+"""
+import base64
+
+import numpy as np
+
+
+class BallField:
+    def __init__(self, count, width, height, ball_size=10, speed=(240.0, 420.0), seed=None):
+        self.width = width
+        self.height = height
+        self.ball_size = ball_size
+        self.speed = speed
+        self.rng = np.random.default_rng(seed)
+
+        # (N, 2) arrays of top-left corners and velocities in pixels per second
+        self.positions = np.empty((count, 2), dtype=np.float32)
+        self.velocities = np.empty((count, 2), dtype=np.float32)
+        self.respawn(np.ones(count, dtype=bool))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def respawn(self, mask):
+        """Serve the selected balls from the centre in random directions"""
+        count = int(mask.sum())
+        if not count:
+            return
+        angles = self.rng.uniform(-np.pi / 4, np.pi / 4, count)
+        speeds = self.rng.uniform(*self.speed, count)
+        sides = self.rng.choice(np.array([-1.0, 1.0]), count)
+        self.velocities[mask, 0] = np.cos(angles) * speeds * sides
+        self.velocities[mask, 1] = np.sin(angles) * speeds
+        # Spread serves vertically so they don't all overlap
+        self.positions[mask, 0] = (self.width - self.ball_size) / 2
+        self.positions[mask, 1] = self.rng.uniform(0, self.height - self.ball_size, count)
+
+    def step(self, dt, left_paddle, right_paddle):
+        """Advance all balls by dt seconds.
+
+        Paddles are (x, y, width, height) tuples. Returns the number of balls
+        that went out on the left and on the right this tick.
+        """
+        positions, velocities = self.positions, self.velocities
+        size = self.ball_size
+        previous = positions.copy()
+        positions += velocities * dt
+
+        # Top and bottom walls: reflect the overshoot back into the field
+        y = positions[:, 1]
+        top = y < 0
+        y[top] = -y[top]
+        velocities[top, 1] = np.abs(velocities[top, 1])
+        limit = self.height - size
+        bottom = y > limit
+        y[bottom] = 2 * limit - y[bottom]
+        velocities[bottom, 1] = -np.abs(velocities[bottom, 1])
+
+        # Left paddle: ball's left edge crossing the paddle's right face
+        px, py, pw, ph = left_paddle
+        self._sweep(previous, px + pw, py, ph, moving_left=True)
+
+        # Right paddle: ball's right edge crossing the paddle's left face
+        px, py, pw, ph = right_paddle
+        self._sweep(previous, px - size, py, ph, moving_left=False)
+
+        # Scoring
+        x = positions[:, 0]
+        out_left = x < 0
+        out_right = x > self.width - size
+        left_count = int(out_left.sum())
+        right_count = int(out_right.sum())
+        if left_count or right_count:
+            self.respawn(out_left | out_right)
+        return left_count, right_count
+
+    def _sweep(self, previous, face, paddle_y, paddle_height, moving_left):
+        positions, velocities = self.positions, self.velocities
+        old_x = previous[:, 0]
+        new_x = positions[:, 0]
+        if moving_left:
+            crossing = (old_x >= face) & (new_x < face)
+        else:
+            crossing = (old_x <= face) & (new_x > face)
+        if not crossing.any():
+            return
+
+        # Where along its path did each crossing ball reach the face?
+        index = np.nonzero(crossing)[0]
+        travel = new_x[index] - old_x[index]
+        t = (face - old_x[index]) / travel
+        y_at_face = previous[index, 1] + t * (positions[index, 1] - previous[index, 1])
+        hit = (y_at_face + self.ball_size > paddle_y) & (y_at_face < paddle_y + paddle_height)
+        index = index[hit]
+        if not len(index):
+            return
+
+        # Mirror the remaining travel back off the face
+        positions[index, 0] = 2 * face - positions[index, 0]
+        velocities[index, 0] = -velocities[index, 0]
+
+    def pack(self):
+        """Positions quantized to little-endian uint16 pairs, base64 for JSON"""
+        quantized = np.clip(self.positions, 0, 65535).astype("<u2")
+        return base64.b64encode(quantized.tobytes()).decode("ascii")
+
+    @staticmethod
+    def unpack(packed):
+        """Decode a pack() snapshot into an (N, 2) uint16 array.
+
+        Takes the base64 text, or the raw bytes as binary frames carry them
+        (read in place, without a copy).
+        """
+        if isinstance(packed, str):
+            packed = base64.b64decode(packed)
+        return np.frombuffer(packed, dtype="<u2").reshape(-1, 2)
@@ -0,0 +1,84 @@
+"""Measure cold start to the first interactive main-menu frame.
+
+Each run is a fresh interpreter so imports and SDL init are really cold.
+"eager" reproduces the old startup (pygame.init(), fonts and every game
+module loaded up front) as a baseline for "lazy", the current GamingHub.
+
+    python bench_startup.py --runs 10
+    SDL_VIDEODRIVER=dummy python bench_startup.py   # headless
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def child(mode):
+    start = time.perf_counter()
+    import pygame
+    imported = time.perf_counter()
+
+    if mode == "lazy":
+        from game_hub import GamingHub
+        hub = GamingHub()
+        initialized = time.perf_counter()
+        hub.draw_main_menu()
+    else:
+        import importlib
+        from game_hub import GamingHub
+        from games import game_modules
+        pygame.init()
+        for name in game_modules():
+            importlib.import_module(name)
+        for size in (36, 72, 74):
+            pygame.font.Font(None, size)
+        hub = GamingHub()
+        initialized = time.perf_counter()
+        hub.draw_main_menu()
+
+    pygame.display.flip()
+    first_frame = time.perf_counter()
+    print(json.dumps({
+        "import": imported - start,
+        "init": initialized - imported,
+        "first_frame": first_frame - initialized,
+        "in_process": first_frame - start
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hub startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=["lazy", "eager"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    for mode in ("eager", "lazy"):
+        totals = []
+        phases = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, __file__, "--child", mode], cwd=HERE, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            totals.append(time.perf_counter() - start)
+            phases.append(json.loads(output.strip().splitlines()[-1]))
+
+        def median_ms(key):
+            return statistics.median(p[key] for p in phases) * 1000
+
+        print(f"{mode:>5}: process start -> menu {statistics.median(totals) * 1000:7.1f} ms "
+              f"(import {median_ms('import'):.1f}, init {median_ms('init'):.1f}, "
+              f"first frame {median_ms('first_frame'):.1f})")
+
+
+if __name__ == "__main__":
+    main()
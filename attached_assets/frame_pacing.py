@@ -0,0 +1,66 @@
+import math
+
+import pygame
+
+# Posted by network threads so a sleeping screen wakes up and redraws
+NETWORK_EVENT = pygame.USEREVENT + 1
+
+# Events that never change what a menu or game screen shows
+PASSIVE_EVENTS = {pygame.NOEVENT, pygame.MOUSEMOTION, pygame.ACTIVEEVENT, pygame.WINDOWENTER,
+                  pygame.WINDOWLEAVE, pygame.AUDIODEVICEADDED, pygame.AUDIODEVICEREMOVED}
+
+
+def notify_redraw():
+    """Wake whichever screen is waiting in FrameScheduler.wait; safe from any thread"""
+    if pygame.display.get_init():
+        try:
+            pygame.event.post(pygame.event.Event(NETWORK_EVENT))
+        except pygame.error:
+            pass
+
+
+class FrameScheduler:
+    """Event-driven frame pacing.
+
+    While a screen is static the loop blocks in ``pygame.event.wait`` and only
+    redraws after input, a network notification or a timer. When it is
+    animating (``invalidate`` every frame) redraws are capped at ``max_fps``.
+    """
+    def __init__(self, max_fps=30):
+        self.frame_interval = 1000 / max_fps
+        self.dirty = True
+        self.last_frame = -self.frame_interval
+
+    def invalidate(self):
+        self.dirty = True
+
+    def wait(self, timeout=None):
+        """Return pending events, sleeping until there are some.
+
+        ``timeout`` (ms) bounds the sleep for callers that need to poll
+        something else, such as a socket or a countdown.
+        """
+        if self.dirty:
+            # Sleep until the next frame slot rather than spinning
+            remaining = self.last_frame + self.frame_interval - pygame.time.get_ticks()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        if timeout is not None and timeout <= 0:
+            events = pygame.event.get()
+        else:
+            # pygame treats a zero timeout as "wait forever"
+            first = pygame.event.wait(0 if timeout is None else max(1, math.ceil(timeout)))
+            events = [] if first.type == pygame.NOEVENT else [first]
+            events.extend(pygame.event.get())
+
+        for event in events:
+            if event.type not in PASSIVE_EVENTS:
+                self.dirty = True
+        return events
+
+    def should_draw(self):
+        return self.dirty and pygame.time.get_ticks() - self.last_frame >= self.frame_interval
+
+    def frame_drawn(self):
+        self.dirty = False
+        self.last_frame = pygame.time.get_ticks()
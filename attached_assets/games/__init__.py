@@ -0,0 +1,58 @@
+"""Registry of the hub's games.
+
+Game modules are only imported when a game is first created (or prewarmed
+in the background), so adding a game costs nothing at startup. The list
+index is what goes over the wire in ``game_selection``; append new games
+rather than reordering.
+
+Entries marked ``local`` are played against the computer: the game gets no
+connection even when the hub has one, and each side plays its own match.
+"""
+import importlib
+
+
+class GameEntry:
+    def __init__(self, name, description, module, class_name, options=None, local=False):
+        self.name = name
+        self.description = description
+        self.module = module
+        self.class_name = class_name
+        self.options = options or {}
+        self.local = local
+
+    def load(self):
+        module = importlib.import_module(self.module)
+        return getattr(module, self.class_name)
+
+
+GAME_REGISTRY = []
+
+
+def register_game(name, description, module, class_name, options=None, local=False):
+    entry = GameEntry(name, description, module, class_name, options, local)
+    GAME_REGISTRY.append(entry)
+    return entry
+
+
+def create_game(index, screen, is_host, connection):
+    if not 0 <= index < len(GAME_REGISTRY):
+        return None
+    entry = GAME_REGISTRY[index]
+    if entry.local:
+        connection = None
+    return entry.load()(screen, is_host, connection, **entry.options)
+
+
+def game_modules():
+    return [entry.module for entry in GAME_REGISTRY]
+
+
+register_game("Pong", "Classic table tennis game", "games.pong", "PongGame")
+register_game("Tic-Tac-Toe", "Classic X and O game", "games.tic_tac_toe", "TicTacToeGame")
+register_game("Snake", "Multiplayer Snake game", "games.snake", "SnakeGame")
+register_game("Snake Arena", "Dozens of snakes on a huge board", "games.snake_arena", "ArenaSnakeGame")
+register_game("Pong Party", "Hundreds of balls at once", "games.pong_party", "PongPartyGame")
+register_game("Tic-Tac-Toe 5x5", "Four in a row on a bigger board", "games.tic_tac_toe", "TicTacToeGame",
+              {"board_size": 5, "win_length": 4})
+register_game("Tic-Tac-Toe vs AI", "Practice against the computer", "games.tic_tac_toe", "TicTacToeGame",
+              {"ai_opponent": True}, local=True)
@@ -0,0 +1,121 @@
+import pygame
+import time
+from enum import Enum
+
+from frame_pacing import FrameScheduler
+from metrics import ACTIVE_GAMES, DROPPED_MESSAGES, FRAME_SECONDS, TICK_SECONDS
+from stats_store import WIN, LOSS, DRAW
+from viewport import map_event, present
+from wire import METADATA_MESSAGES
+
+# Game States
+class GameState(Enum):
+    MAIN_MENU = 0
+    WAITING_FOR_CONNECTION = 1
+    GAME_SELECTION = 2
+    PLAYING = 3
+
+class Game:
+    """Base class for all games in the hub"""
+    frame_rate = 60
+    receive_size = 1024
+    
+    def __init__(self, screen):
+        self.screen = screen
+        self.running = True
+        
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        
+    def update(self):
+        pass
+        
+    def render(self):
+        pass
+        
+    def is_idle(self):
+        """True when nothing changes until the next input or network message"""
+        return False
+        
+    def result(self):
+        """WIN, LOSS or DRAW for the local player, or None if the match had no outcome"""
+        return None
+        
+    def drop_message(self, reason):
+        """Count a received message that had to be ignored"""
+        DROPPED_MESSAGES.labels(type(self).__name__, reason).inc()
+        
+    def message_handlers(self):
+        """Handlers for the messages this game accepts, by wire type name (see wire.py)"""
+        return {}
+        
+    def receive_data(self):
+        """Network thread: read messages off the connection and dispatch them"""
+        handlers = self.message_handlers()
+        while self.running:
+            try:
+                messages = self.connection.receive(self.receive_size)
+            except ConnectionError:
+                # The opponent left; carry on locally
+                break
+            except:
+                continue
+            
+            for name, fields in messages:
+                if name is None:
+                    # Undecodable, or a type this version doesn't know
+                    self.drop_message(fields)
+                    continue
+                if name in METADATA_MESSAGES:
+                    continue
+                handler = handlers.get(name)
+                if handler is None:
+                    self.drop_message("unhandled")
+                    continue
+                try:
+                    handler(fields)
+                except (KeyError, TypeError, IndexError, ValueError):
+                    self.drop_message("malformed")
+        
+    def run(self):
+        scheduler = FrameScheduler(self.frame_rate)
+        name = type(self).__name__
+        tick_seconds = TICK_SECONDS.labels(name)
+        frame_seconds = FRAME_SECONDS.labels(name)
+        active = ACTIVE_GAMES.labels(name)
+        active.inc()
+        
+        while self.running:
+            # Animating games redraw every frame; idle ones sleep until woken
+            if not self.is_idle():
+                scheduler.invalidate()
+                
+            for event in scheduler.wait():
+                # Games hit-test in logical 800x600 coordinates whatever the window size;
+                # clicks in the letterbox bars belong to no game
+                event = map_event(event)
+                if event is not None:
+                    self.handle_event(event)
+                
+            if scheduler.should_draw():
+                started = time.perf_counter()
+                self.update()
+                updated = time.perf_counter()
+                self.render()
+                
+                present()
+                scheduler.frame_drawn()
+                tick_seconds.observe(updated - started)
+                frame_seconds.observe(time.perf_counter() - started)
+        
+        active.dec()
+        return GameState.GAME_SELECTION
+
+
+def compare_scores(player_score, opponent_score):
+    if player_score > opponent_score:
+        return WIN
+    if player_score < opponent_score:
+        return LOSS
+    return DRAW
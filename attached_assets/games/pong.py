@@ -0,0 +1,191 @@
+import pygame
+import random
+import threading
+
+from assets import get_font
+from games.base import Game, compare_scores
+from input_queue import InputQueue
+from sim_core import PongCore, LEFT, RIGHT
+from snapshot_scheduler import pong_snapshots
+
+PADDLE_KEYS = {pygame.K_UP: "up", pygame.K_DOWN: "down"}
+
+
+def valid_paddle_input(command, last_value):
+    return command.action in ("up", "down") and isinstance(command.value, bool)
+
+class PongGame(Game):
+    """Simple Pong game implementation"""
+    # Messages that carry the host's ball and scores
+    state_messages = ("ball", "player_score", "opponent_score")
+    
+    def __init__(self, screen, is_host, connection, seed=None):
+        super().__init__(screen)
+        self.width, self.height = screen.get_size()
+        self.is_host = is_host
+        self.connection = connection
+        
+        # The rules live in a deterministic fixed-point core; only the host
+        # moves its ball. The host's paddle is on the left.
+        self.core = PongCore(self.width, self.height, random.getrandbits(32) if seed is None else seed)
+        self.player_side = LEFT if is_host else RIGHT
+        self.opponent_side = RIGHT if is_host else LEFT
+        
+        # Game objects, drawn from the core's state
+        self.paddle_width = self.core.paddle_width
+        self.paddle_height = self.core.paddle_height
+        self.player_paddle = pygame.Rect(self.core.paddle_x[self.player_side], self.core.paddle_y[self.player_side],
+                                 self.paddle_width, self.paddle_height)
+        self.opponent_paddle = pygame.Rect(self.core.paddle_x[self.opponent_side],
+                                   self.core.paddle_y[self.opponent_side],
+                                   self.paddle_width, self.paddle_height)
+        
+        # Ball properties
+        self.ball_size = self.core.ball_size
+        self.ball = pygame.Rect(self.core.ball_position(), (self.ball_size, self.ball_size))
+        
+        # Scoring
+        self.player_score = 0
+        self.opponent_score = 0
+        self.font = get_font(74)
+        
+        # Fixed-step simulation fed by timestamped key commands, so paddle
+        # speed no longer depends on the rendered frame rate
+        self.tick_ms = 1000 / 60
+        self.max_steps = 5
+        self.tick = 0
+        self.sim_time = pygame.time.get_ticks()
+        self.player_inputs = InputQueue(valid_paddle_input, max_pending=16)
+        self.opponent_inputs = InputQueue(valid_paddle_input, max_pending=16)
+        self.player_held = {"up": False, "down": False}
+        self.opponent_held = {"up": False, "down": False}
+        
+        # Paddles and ball go out every tick; scores only when they change,
+        # or once a second in case a packet was dropped
+        self.snapshots = pong_snapshots()
+        
+        # Network communication thread
+        self.receive_thread = threading.Thread(target=self.receive_data)
+        self.receive_thread.daemon = True
+        self.receive_thread.start()
+        
+    def handle_event(self, event):
+        super().handle_event(event)
+        
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in PADDLE_KEYS:
+            self.player_inputs.push(PADDLE_KEYS[event.key], event.type == pygame.KEYDOWN,
+                                    pygame.time.get_ticks())
+        
+    def update(self):
+        # Run as many fixed ticks as real time has covered
+        now = pygame.time.get_ticks()
+        steps = 0
+        while self.sim_time + self.tick_ms <= now and steps < self.max_steps:
+            self.sim_time += self.tick_ms
+            self.tick += 1
+            steps += 1
+            self.step()
+        if steps == self.max_steps:
+            # Too far behind (window dragged, debugger); don't fast-forward
+            self.sim_time = now
+            
+        # Send paddle position and any new inputs, plus the ball from the host,
+        # in one packet
+        values = {
+            "paddle_y": self.player_paddle.y,
+            "inputs": self.player_inputs.take_outgoing() or None
+        }
+        if self.is_host and steps:
+            values.update(self.ball_state())
+        data = self.snapshots.build(self.tick, values)
+        if data:
+            try:
+                self.connection.send(data)
+            except:
+                pass
+    
+    def ball_state(self):
+        return {
+            "paddle_y": self.player_paddle.y,
+            "ball_x": self.ball.x,
+            "ball_y": self.ball.y,
+            "player_score": self.player_score,
+            "opponent_score": self.opponent_score
+        }
+    
+    def apply_ball_state(self, game_data):
+        if "ball_x" in game_data:
+            self.ball.x = game_data["ball_x"]
+            self.ball.y = game_data["ball_y"]
+        self.apply_scores(game_data)
+    
+    def apply_scores(self, game_data):
+        # Scores are only sent when they change; the host's player is our opponent
+        self.player_score = game_data.get("opponent_score", self.player_score)
+        self.opponent_score = game_data.get("player_score", self.opponent_score)
+    
+    def step(self):
+        # Local commands apply at the tick they were pressed in; remote ones as they arrive
+        for command in self.player_inputs.pop_all(self.tick, until=self.sim_time):
+            self.player_held[command.action] = command.value
+        for command in self.opponent_inputs.pop_all(self.tick):
+            self.opponent_held[command.action] = command.value
+        
+        moves = [0, 0]
+        moves[self.player_side] = self.player_held["down"] - self.player_held["up"]
+        moves[self.opponent_side] = self.opponent_held["down"] - self.opponent_held["up"]
+        self.core.step(*moves, move_ball=False)
+        self.player_paddle.y = self.core.paddle_y[self.player_side]
+        self.opponent_paddle.y = self.core.paddle_y[self.opponent_side]
+        
+        # Update ball if host
+        if self.is_host:
+            self.step_ball()
+    
+    def step_ball(self):
+        self.core.step_ball()
+        self.ball.topleft = self.core.ball_position()
+        self.player_score, self.opponent_score = self.core.scores
+    
+    def result(self):
+        return compare_scores(self.player_score, self.opponent_score)
+    
+    def message_handlers(self):
+        handlers = {"inputs": self.receive_inputs, "paddle": self.receive_paddle}
+        if not self.is_host:
+            for name in self.state_messages:
+                handlers[name] = self.apply_ball_state
+        return handlers
+    
+    def receive_inputs(self, message):
+        self.opponent_inputs.receive(message["inputs"])
+    
+    def receive_paddle(self, message):
+        # The owner's paddle position stays authoritative
+        self.core.paddle_y[self.opponent_side] = message["paddle_y"]
+        self.opponent_paddle.y = message["paddle_y"]
+    
+    def render_ball(self):
+        pygame.draw.ellipse(self.screen, (200, 200, 200), self.ball)
+    
+    def render(self):
+        # Clear screen
+        self.screen.fill((0, 0, 0))
+        
+        # Draw middle line
+        pygame.draw.aaline(self.screen, (200, 200, 200), 
+                         (self.width//2, 0), (self.width//2, self.height))
+        
+        # Draw paddles
+        pygame.draw.rect(self.screen, (200, 200, 200), self.player_paddle)
+        pygame.draw.rect(self.screen, (200, 200, 200), self.opponent_paddle)
+        
+        # Draw ball
+        self.render_ball()
+        
+        # Draw scores
+        player_text = self.font.render(str(self.player_score), True, (200, 200, 200))
+        opponent_text = self.font.render(str(self.opponent_score), True, (200, 200, 200))
+        
+        self.screen.blit(player_text, (self.width//4, 20))
+        self.screen.blit(opponent_text, (3*self.width//4, 20))
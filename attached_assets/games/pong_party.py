@@ -0,0 +1,51 @@
+import pygame
+
+from ball_field import BallField
+from games.pong import PongGame
+
+
+class PongPartyGame(PongGame):
+    """Pong with hundreds of balls in play at once"""
+    # Packed snapshots for hundreds of balls don't fit the base game's buffer
+    receive_size = 65536
+    state_messages = ("balls", "player_score", "opponent_score")
+
+    def __init__(self, screen, is_host, connection, ball_count=200, ball_size=10):
+        self.field = None
+        self.remote_balls = None
+        super().__init__(screen, is_host, connection)
+        self.field = BallField(ball_count, self.width, self.height, ball_size)
+        # The packed balls go out every tick; keep the usual room for scores on top
+        self.snapshots.max_bytes += len(self.field.pack())
+
+        # One pre-drawn ball blitted in a single batch beats hundreds of draw calls
+        self.ball_surface = pygame.Surface((ball_size, ball_size), pygame.SRCALPHA)
+        pygame.draw.ellipse(self.ball_surface, (200, 200, 200), self.ball_surface.get_rect())
+
+    def step_ball(self):
+        # The host's paddle is always the left one
+        left, right = self.player_paddle, self.opponent_paddle
+        out_left, out_right = self.field.step(self.tick_ms / 1000, tuple(left), tuple(right))
+        self.player_score += out_right
+        self.opponent_score += out_left
+
+    def ball_state(self):
+        return {
+            "paddle_y": self.player_paddle.y,
+            "balls": self.field.pack(),
+            "player_score": self.player_score,
+            "opponent_score": self.opponent_score
+        }
+
+    def apply_ball_state(self, game_data):
+        if "balls" in game_data:
+            self.remote_balls = BallField.unpack(game_data["balls"])
+        self.apply_scores(game_data)
+
+    def render_ball(self):
+        if self.is_host:
+            positions = self.field.positions if self.field is not None else ()
+        else:
+            positions = self.remote_balls if self.remote_balls is not None else ()
+        surface = self.ball_surface
+        self.screen.blits([(surface, (int(x), int(y))) for x, y in positions], doreturn=False)
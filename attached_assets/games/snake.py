@@ -0,0 +1,236 @@
+import pygame
+import random
+import threading
+
+from assets import get_font
+from games.base import Game, compare_scores
+from input_queue import InputQueue
+from sim_core import OPPOSITE, SnakeCore, cell_dicts
+from snapshot_scheduler import snake_snapshots
+
+DIRECTION_KEYS = {
+    pygame.K_UP: "up",
+    pygame.K_DOWN: "down",
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right"
+}
+
+# Messages carrying the state the host replicates; their fields are named
+# from the receiving player's point of view
+SNAPSHOT_MESSAGES = ("snakes", "food", "player_score", "opponent_score",
+                     "player_alive", "opponent_alive", "game_over")
+
+
+def valid_turn(command, last_value):
+    # Checked against the last queued turn, so a quick up-then-left is kept
+    # but a reverse into the snake's own neck never is
+    return (command.action == "turn" and command.value in OPPOSITE and
+            command.value != last_value and command.value != OPPOSITE.get(last_value))
+
+class SnakeGame(Game):
+    """Snake game with multiplayer capabilities"""
+    def __init__(self, screen, is_host, connection, seed=None):
+        super().__init__(screen)
+        self.width, self.height = screen.get_size()
+        self.is_host = is_host
+        self.connection = connection
+        
+        # Game parameters
+        self.grid_size = 20
+        self.grid_width = self.width // self.grid_size
+        self.grid_height = self.height // self.grid_size
+        
+        # Colors
+        self.bg_color = (0, 0, 0)
+        self.player_color = (0, 255, 0)
+        self.opponent_color = (0, 0, 255)
+        self.food_color = (255, 0, 0)
+        self.text_color = (255, 255, 255)
+        
+        # The rules live in a deterministic core that only the host steps;
+        # the guest builds one just for the starting layout. Snake 0 is the host's.
+        self.core = SnakeCore(self.grid_width, self.grid_height,
+                              random.getrandbits(32) if seed is None else seed)
+        self.player_index = 0 if is_host else 1
+        self.opponent_index = 1 - self.player_index
+        
+        # Snakes as the wire and renderer see them
+        self.player_snake = cell_dicts(self.core.snakes[self.player_index])
+        self.opponent_snake = cell_dicts(self.core.snakes[self.opponent_index])
+        
+        # Direction: "up", "down", "left", "right"
+        self.player_direction = self.core.directions[self.player_index]
+        self.opponent_direction = self.core.directions[self.opponent_index]
+        
+        # Turns queued between moves; each move consumes at most one per snake
+        self.player_inputs = InputQueue(valid_turn, initial=self.player_direction)
+        self.opponent_inputs = InputQueue(valid_turn, initial=self.opponent_direction)
+        self.tick = 0
+        
+        # Food
+        self.food = self.food_cell()
+        
+        # Scores
+        self.player_score = 0
+        self.opponent_score = 0
+        self.font = get_font(36)
+        
+        # Game state
+        self.game_over = False
+        self.player_alive = True
+        self.opponent_alive = True
+        
+        # Snakes go out every move; the rest only when it changes, or after a
+        # few moves in case a packet was dropped
+        self.snapshots = snake_snapshots()
+        
+        # Movement delay for snake speed
+        self.last_move_time = pygame.time.get_ticks()
+        self.move_delay = 150  # milliseconds
+        
+        # Network communication thread
+        self.receive_thread = threading.Thread(target=self.receive_data)
+        self.receive_thread.daemon = True
+        self.receive_thread.start()
+        
+    def food_cell(self):
+        food = self.core.food
+        return {"x": food[0], "y": food[1]} if food else None
+    
+    def handle_event(self, event):
+        super().handle_event(event)
+        
+        # Handle key presses for snake direction
+        if event.type == pygame.KEYDOWN and self.player_alive and event.key in DIRECTION_KEYS:
+            command = self.player_inputs.push("turn", DIRECTION_KEYS[event.key], pygame.time.get_ticks())
+                
+            if command:
+                # Send direction change to opponent
+                try:
+                    data = {
+                        "inputs": self.player_inputs.take_outgoing(),
+                        "direction": command.value
+                    }
+                    self.connection.send(data)
+                except:
+                    pass
+    
+    def update(self):
+        current_time = pygame.time.get_ticks()
+        
+        # Move snake at regular intervals
+        if current_time - self.last_move_time > self.move_delay and not self.game_over:
+            self.last_move_time = current_time
+            self.tick += 1
+            
+            # Apply the next queued turn for each snake
+            turn = self.player_inputs.pop(self.tick)
+            if turn:
+                self.player_direction = turn.value
+            turn = self.opponent_inputs.pop(self.tick)
+            if turn:
+                self.opponent_direction = turn.value
+            
+            # Only the host updates the game state
+            if self.is_host:
+                core = self.core
+                core.step((self.player_direction, self.opponent_direction))
+                
+                self.player_snake = cell_dicts(core.snakes[0])
+                self.opponent_snake = cell_dicts(core.snakes[1])
+                self.food = self.food_cell()
+                self.player_score, self.opponent_score = core.scores
+                self.player_alive, self.opponent_alive = core.alive
+                self.game_over = core.game_over
+                
+                # Send game state to opponent; this is the last update once
+                # the game is over, so nothing may be held back for later
+                data = self.snapshots.build(self.tick, {
+                    "player_snake": self.opponent_snake,
+                    "opponent_snake": self.player_snake,
+                    "food": self.food,
+                    "player_score": self.opponent_score,
+                    "opponent_score": self.player_score,
+                    "player_alive": self.opponent_alive,
+                    "opponent_alive": self.player_alive,
+                    "game_over": self.game_over
+                }, flush=self.game_over)
+                try:
+                    self.connection.send(data)
+                except:
+                    pass
+    
+    def is_idle(self):
+        return self.game_over
+    
+    def result(self):
+        return compare_scores(self.player_score, self.opponent_score)
+    
+    def message_handlers(self):
+        handlers = {"inputs": self.receive_inputs, "direction": self.receive_direction}
+        if not self.is_host:
+            for name in SNAPSHOT_MESSAGES:
+                handlers[name] = self.apply_snapshot
+        return handlers
+    
+    def receive_inputs(self, message):
+        self.opponent_inputs.receive(message["inputs"])
+    
+    def receive_direction(self, message):
+        # Peers without an input queue only send the new direction; the
+        # rest send their inputs first and the direction is redundant
+        if self.opponent_inputs.last_remote_sequence < 0:
+            self.opponent_inputs.push("turn", message["direction"], send=False)
+    
+    def apply_snapshot(self, message):
+        # Slow fields are only sent when they change
+        for key, value in message.items():
+            setattr(self, key, value)
+    
+    def render(self):
+        # Clear screen
+        self.screen.fill(self.bg_color)
+        
+        # Draw grid lines (optional)
+        for x in range(0, self.width, self.grid_size):
+            pygame.draw.line(self.screen, (50, 50, 50), (x, 0), (x, self.height))
+        for y in range(0, self.height, self.grid_size):
+            pygame.draw.line(self.screen, (50, 50, 50), (0, y), (self.width, y))
+        
+        # Draw player snake
+        for segment in self.player_snake:
+            pygame.draw.rect(self.screen, self.player_color, 
+                           (segment["x"] * self.grid_size, segment["y"] * self.grid_size, 
+                            self.grid_size, self.grid_size))
+                            
+        # Draw opponent snake
+        for segment in self.opponent_snake:
+            pygame.draw.rect(self.screen, self.opponent_color, 
+                           (segment["x"] * self.grid_size, segment["y"] * self.grid_size, 
+                            self.grid_size, self.grid_size))
+        
+        # Draw food (there's none once the board is full)
+        if self.food:
+            pygame.draw.rect(self.screen, self.food_color, 
+                           (self.food["x"] * self.grid_size, self.food["y"] * self.grid_size, 
+                            self.grid_size, self.grid_size))
+        
+        # Draw scores
+        player_text = self.font.render(f"You: {self.player_score}", True, self.text_color)
+        opponent_text = self.font.render(f"Opponent: {self.opponent_score}", True, self.text_color)
+        
+        self.screen.blit(player_text, (10, 10))
+        self.screen.blit(opponent_text, (self.width - 150, 10))
+        
+        # Draw game over message
+        if self.game_over:
+            font = get_font(72)
+            if self.player_score > self.opponent_score:
+                text = font.render("You Win!", True, (0, 255, 0))
+            elif self.player_score < self.opponent_score:
+                text = font.render("You Lose!", True, (255, 0, 0))
+            else:
+                text = font.render("Draw!", True, (255, 255, 255))
+                
+            text_rect = text.get_rect(center=(self.width//2, self.height//2))
+            self.screen.blit(text, text_rect)
@@ -0,0 +1,155 @@
+import pygame
+import threading
+
+from arena_engine import SnakeArena, FOOD
+from assets import get_font
+from games.base import Game
+from games.snake import DIRECTION_KEYS, valid_turn
+from input_queue import InputQueue
+
+SNAKE_COLORS = [(0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255), (255, 128, 0),
+                (128, 0, 255), (255, 255, 255), (128, 128, 128)]
+
+
+class ArenaSnakeGame(Game):
+    """Large-board Snake where both players share the arena with AI snakes"""
+    receive_size = 65536
+
+    def __init__(self, screen, is_host, connection, board_size=(500, 500), bot_count=30, move_delay=120):
+        super().__init__(screen)
+        self.width, self.height = screen.get_size()
+        self.is_host = is_host
+        self.connection = connection
+
+        # Each player sees a window of the board centred on their own head
+        self.grid_size = 20
+        self.view_width = self.width // self.grid_size
+        self.view_height = self.height // self.grid_size
+
+        # Colors
+        self.bg_color = (0, 0, 0)
+        self.player_color = (0, 255, 0)
+        self.food_color = (255, 0, 0)
+        self.border_color = (80, 80, 80)
+        self.text_color = (255, 255, 255)
+        self.font = get_font(28)
+
+        # Turns queued between moves, one consumed per tick. The host validates
+        # every turn, so the guest just forwards its key presses.
+        self.player_inputs = InputQueue(valid_turn if is_host else None)
+        self.opponent_inputs = InputQueue(valid_turn)
+
+        self.move_delay = move_delay  # milliseconds
+        self.last_move_time = pygame.time.get_ticks()
+        self.snapshot = None
+
+        # Only the host owns the arena; the client draws the snapshots it receives
+        self.arena = None
+        if is_host:
+            self.arena = SnakeArena(*board_size)
+            self.player_id = self.arena.add_snake("Host")
+            self.opponent_id = self.arena.add_snake("Guest")
+            for _ in range(bot_count):
+                self.arena.add_snake(is_bot=True)
+            self.player_inputs.last_value = self.arena.snakes[self.player_id].direction
+            self.opponent_inputs.last_value = self.arena.snakes[self.opponent_id].direction
+            self.snapshot = self.arena.view(self.player_id, self.view_width, self.view_height)
+
+        # Network communication thread
+        if connection is not None:
+            self.receive_thread = threading.Thread(target=self.receive_data)
+            self.receive_thread.daemon = True
+            self.receive_thread.start()
+
+    def handle_event(self, event):
+        super().handle_event(event)
+
+        if event.type == pygame.KEYDOWN and event.key in DIRECTION_KEYS:
+            command = self.player_inputs.push("turn", DIRECTION_KEYS[event.key], pygame.time.get_ticks())
+            if command and not self.is_host:
+                self.player_inputs.pop_all(self.snapshot["tick"] if self.snapshot else 0)
+                try:
+                    data = {"inputs": self.player_inputs.take_outgoing()}
+                    self.connection.send(data)
+                except:
+                    pass
+
+    def update(self):
+        current_time = pygame.time.get_ticks()
+        if not self.is_host or current_time - self.last_move_time <= self.move_delay:
+            return
+        self.last_move_time = current_time
+
+        for snake_id, inputs in ((self.player_id, self.player_inputs), (self.opponent_id, self.opponent_inputs)):
+            turn = inputs.pop(self.arena.tick)
+            if turn:
+                self.arena.steer(snake_id, turn.value)
+
+        # Everyone who died is back next tick; humans keep playing until they quit
+        for snake_id in self.arena.step():
+            self.arena.respawn(snake_id)
+            inputs = {self.player_id: self.player_inputs, self.opponent_id: self.opponent_inputs}.get(snake_id)
+            if inputs:
+                inputs.pending.clear()
+                inputs.last_value = self.arena.snakes[snake_id].direction
+
+        self.snapshot = self.arena.view(self.player_id, self.view_width, self.view_height)
+
+        # The guest only receives what falls inside their own viewport
+        if self.connection is not None:
+            try:
+                data = {"arena": self.arena.view(self.opponent_id, self.view_width, self.view_height)}
+                self.connection.send(data)
+            except:
+                pass
+
+    def message_handlers(self):
+        if self.is_host:
+            return {"inputs": self.receive_inputs}
+        return {"arena": self.receive_snapshot}
+
+    def receive_inputs(self, message):
+        self.opponent_inputs.receive(message["inputs"])
+
+    def receive_snapshot(self, message):
+        self.snapshot = message["arena"]
+
+    def render(self):
+        # Clear screen
+        self.screen.fill(self.bg_color)
+
+        snapshot = self.snapshot
+        if not snapshot:
+            return
+
+        x0, y0, view_width, view_height = snapshot["view"]
+        board_width, board_height = snapshot["board"]
+        you = snapshot["you"]
+        size = self.grid_size
+
+        # Draw the board edge when it's inside the viewport
+        right = (board_width - x0) * size
+        bottom = (board_height - y0) * size
+        if right < self.width:
+            pygame.draw.rect(self.screen, self.border_color, (right, 0, self.width - right, self.height))
+        if bottom < self.height:
+            pygame.draw.rect(self.screen, self.border_color, (0, bottom, self.width, self.height - bottom))
+
+        # Draw snakes and food inside the viewport
+        cells = snapshot["cells"]
+        for i in range(0, len(cells), 3):
+            dx, dy, occupant = cells[i], cells[i + 1], cells[i + 2]
+            if occupant == FOOD:
+                color = self.food_color
+            elif occupant == you:
+                color = self.player_color
+            else:
+                color = SNAKE_COLORS[occupant % len(SNAKE_COLORS)]
+            pygame.draw.rect(self.screen, color, (dx * size, dy * size, size, size))
+
+        # Draw score and leaderboard
+        score_text = self.font.render(f"Score: {snapshot['score']}", True, self.text_color)
+        self.screen.blit(score_text, (10, 10))
+        for rank, (name, score) in enumerate(snapshot["leaders"]):
+            leader_text = self.font.render(f"{rank + 1}. {name}: {score}", True, self.text_color)
+            self.screen.blit(leader_text, (self.width - 180, 10 + rank * 24))
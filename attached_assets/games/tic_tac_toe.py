@@ -0,0 +1,160 @@
+import pygame
+import threading
+
+from assets import get_font
+from frame_pacing import notify_redraw
+from games.base import Game
+from stats_store import WIN, LOSS, DRAW
+from tictactoe_engine import BitBoard, TicTacToeAI, EMPTY, X, O
+
+class TicTacToeGame(Game):
+    """Tic-Tac-Toe on an N×N bitboard with K-in-a-row wins and an optional AI opponent"""
+    def __init__(self, screen, is_host, connection, board_size=3, win_length=None, ai_opponent=False):
+        super().__init__(screen)
+        self.width, self.height = screen.get_size()
+        self.is_host = is_host
+        self.connection = connection
+        
+        # Game state
+        self.board_size = board_size
+        self.win_length = win_length or board_size
+        self.board = BitBoard(board_size, self.win_length)
+        self.current_player = X  # X starts
+        self.cell_size = min(self.width, self.height) // board_size
+        self.game_over = False
+        self.winner = EMPTY
+        
+        # Player assignment (host is X, client is O)
+        self.player_piece = X if is_host else O
+        
+        # Local AI plays the other side when there is no network opponent
+        if ai_opponent and connection is not None:
+            raise ValueError("an AI opponent can't play in a networked match")
+        self.ai = None
+        if connection is None:
+            self.ai = TicTacToeAI(O if self.player_piece == X else X)
+        
+        # Network communication thread
+        if connection is not None:
+            self.receive_thread = threading.Thread(target=self.receive_data)
+            self.receive_thread.daemon = True
+            self.receive_thread.start()
+        
+    def handle_event(self, event):
+        super().handle_event(event)
+        
+        if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+            # Only allow moves when it's the player's turn
+            if self.current_player == self.player_piece:
+                x, y = event.pos
+                col = x // self.cell_size
+                row = y // self.cell_size
+                
+                if 0 <= col < self.board_size and 0 <= row < self.board_size:
+                    index = self.board.index(row, col)
+                    if self.board.is_empty(index):
+                        self.apply_move(index, self.player_piece)
+                        self.send_move(row, col)
+    
+    def update(self):
+        if self.ai and not self.game_over and self.current_player == self.ai.piece:
+            self.apply_move(self.ai.choose_move(self.board), self.ai.piece)
+    
+    def is_idle(self):
+        # Only the local AI's turn needs the loop to keep running
+        return self.game_over or self.ai is None or self.current_player != self.ai.piece
+    
+    def result(self):
+        if not self.game_over:
+            return None
+        if self.winner == self.player_piece:
+            return WIN
+        return DRAW if self.winner == EMPTY else LOSS
+    
+    def apply_move(self, index, piece):
+        # The board checks only the lines through this cell for a win
+        self.board.play(index, piece)
+        self.current_player = O if piece == X else X
+        self.winner = self.board.winner
+        self.game_over = self.board.game_over
+    
+    def send_move(self, row, col):
+        if self.connection is None:
+            return
+        try:
+            data = {
+                "move": [row, col],
+                "piece": self.player_piece,
+                "history": self.board.encode_history()
+            }
+            self.connection.send(data)
+        except:
+            pass
+    
+    def sync_history(self, encoded):
+        # Rebuild from the opponent's move list if ours has diverged
+        board = BitBoard.from_history(encoded, self.board_size, self.win_length)
+        if board.history != self.board.history:
+            self.board = board
+            self.current_player = board.piece_to_move()
+            self.winner = board.winner
+            self.game_over = board.game_over
+    
+    def message_handlers(self):
+        return {"move": self.receive_move}
+    
+    def receive_move(self, message):
+        if "history" in message:
+            self.sync_history(message["history"])
+        else:
+            row, col = message["move"]
+            self.apply_move(self.board.index(row, col), message["piece"])
+        notify_redraw()
+    
+    def render(self):
+        # Clear screen
+        self.screen.fill((0, 0, 0))
+        
+        # Draw grid
+        board_extent = self.cell_size * self.board_size
+        for i in range(1, self.board_size):
+            pygame.draw.line(self.screen, (200, 200, 200), 
+                           (0, i * self.cell_size), (board_extent, i * self.cell_size), 2)
+            pygame.draw.line(self.screen, (200, 200, 200), 
+                           (i * self.cell_size, 0), (i * self.cell_size, board_extent), 2)
+        
+        # Draw X's and O's
+        mark_size = self.cell_size // 3
+        mark_width = max(1, min(5, self.cell_size // 12))
+        for index in self.board.history:
+            row, col = self.board.position(index)
+            x = col * self.cell_size + self.cell_size // 2
+            y = row * self.cell_size + self.cell_size // 2
+            
+            if self.board.get(row, col) == X:
+                pygame.draw.line(self.screen, (255, 0, 0), 
+                               (x - mark_size, y - mark_size),
+                               (x + mark_size, y + mark_size), mark_width)
+                pygame.draw.line(self.screen, (255, 0, 0), 
+                               (x + mark_size, y - mark_size),
+                               (x - mark_size, y + mark_size), mark_width)
+            else:  # O
+                pygame.draw.circle(self.screen, (0, 0, 255), (x, y), 
+                                 mark_size, mark_width)
+        
+        # Game status
+        font = get_font(36)
+        if self.game_over:
+            if self.winner == self.player_piece:
+                text = font.render("You win!", True, (0, 255, 0))
+            elif self.winner != EMPTY:
+                text = font.render("You lose!", True, (255, 0, 0))
+            else:
+                text = font.render("Draw!", True, (200, 200, 200))
+        else:
+            if self.current_player == self.player_piece:
+                text = font.render("Your turn", True, (0, 255, 0))
+            else:
+                text = font.render("Opponent's turn", True, (200, 200, 200))
+                
+        self.screen.blit(text, (10, self.height - 40))
@@ -0,0 +1,536 @@
+"""Headless bot clients that speak the GamingHub protocol.
+
+A bot performs the same steps as a human player's hub: the username
+handshake, the ``game_selection`` message and then the in-match messages of
+the chosen game. Hosts run the authoritative side of the match just like
+``PongGame``/``SnakeGame``/``TicTacToeGame`` do when ``is_host`` is set.
+"""
+import random
+import socket
+import threading
+import time
+
+from arena_engine import SnakeArena
+from games import GAME_REGISTRY
+from sim_core import DIRECTIONS, LEFT, OPPOSITE, RIGHT, PongCore, SnakeCore, cell_dicts
+from snapshot_scheduler import pong_snapshots, snake_snapshots
+from tictactoe_engine import BitBoard, TicTacToeAI, X, O
+from wire import METADATA_MESSAGES, PROTOCOL_VERSIONS, Channel, negotiate
+
+# Index order matches the hub's game registry
+GAMES = [entry.name for entry in GAME_REGISTRY]
+
+# Extra key stamped on bot messages for latency measurement; declared in
+# wire.py as metadata, so the hub skips it
+SENT_AT_KEY = "bot_sent_at"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BotStats:
+    """Counters and samples collected by one bot"""
+    def __init__(self):
+        self.tick_times = []
+        self.latencies = []
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.decode_errors = 0
+        self.send_errors = 0
+        self.failed = False
+
+
+class PongPolicy:
+    """Tracks the ball with the paddle; the host also simulates the ball"""
+    tick_rate = 60
+
+    def __init__(self, is_host, width=800, height=600):
+        self.is_host = is_host
+        self.width, self.height = width, height
+        self.paddle_height = 100
+        self.paddle_speed = 8
+        self.ball_size = 15
+
+        # The host runs the same deterministic core as PongGame
+        self.core = PongCore(width, height, random.getrandbits(32))
+        self.paddle_y = height // 2 - self.paddle_height // 2
+        self.opponent_paddle_y = self.paddle_y
+        self.ball_x, self.ball_y = self.core.ball_position()
+        self.player_score = 0
+        self.opponent_score = 0
+
+        # Host paddle sits on the left, client paddle on the right
+        self.paddle_x = 50 if is_host else width - 65
+        self.opponent_paddle_x = width - 65 if is_host else 50
+
+        # Same field schedule as PongGame, so bot traffic matches the hub's
+        self.ticks = 0
+        self.snapshots = pong_snapshots()
+
+    def on_message(self, message):
+        self.opponent_paddle_y = message.get("paddle_y", self.opponent_paddle_y)
+        if not self.is_host and "ball_x" in message:
+            self.ball_x = message["ball_x"]
+            self.ball_y = message["ball_y"]
+        # Hosts only send scores when they change
+        self.player_score = message.get("opponent_score", self.player_score)
+        self.opponent_score = message.get("player_score", self.opponent_score)
+
+    def follow_ball(self):
+        target = self.ball_y + self.ball_size // 2 - self.paddle_height // 2
+        if target < self.paddle_y:
+            self.paddle_y = max(0, self.paddle_y - self.paddle_speed)
+        elif target > self.paddle_y:
+            self.paddle_y = min(self.height - self.paddle_height, self.paddle_y + self.paddle_speed)
+
+    def tick(self):
+        self.follow_ball()
+        if not self.is_host:
+            return [{"paddle_y": self.paddle_y}]
+
+        # Bots steer their paddle directly, so write both positions into the core
+        self.core.paddle_y[LEFT] = self.paddle_y
+        self.core.paddle_y[RIGHT] = self.opponent_paddle_y
+        self.core.step()
+        self.ball_x, self.ball_y = self.core.ball_position()
+        self.player_score, self.opponent_score = self.core.scores
+
+        self.ticks += 1
+        return [self.snapshots.build(self.ticks, {
+            "paddle_y": self.paddle_y,
+            "ball_x": self.ball_x,
+            "ball_y": self.ball_y,
+            "player_score": self.player_score,
+            "opponent_score": self.opponent_score
+        })]
+
+
+class PongPartyPolicy(PongPolicy):
+    """Pong Party: the host simulates every ball, the guest chases the nearest one"""
+    def __init__(self, is_host, width=800, height=600, ball_count=200):
+        super().__init__(is_host, width, height)
+        # Imported here so the other bots work without NumPy
+        from ball_field import BallField
+        self.field_class = BallField
+        self.field = BallField(ball_count, width, height) if is_host else None
+        self.balls = None
+        if is_host:
+            self.snapshots.max_bytes += len(self.field.pack())
+
+    def on_message(self, message):
+        self.opponent_paddle_y = message.get("paddle_y", self.opponent_paddle_y)
+        if not self.is_host and "balls" in message:
+            self.balls = self.field_class.unpack(message["balls"])
+
+    def tick(self):
+        balls = self.field.positions if self.is_host else self.balls
+        if balls is not None and len(balls):
+            # Follow whichever ball is closest to our side
+            distance = abs(balls[:, 0].astype(float) - self.paddle_x)
+            self.ball_y = int(balls[distance.argmin(), 1])
+        self.follow_ball()
+        if not self.is_host:
+            return [{"paddle_y": self.paddle_y}]
+
+        out_left, out_right = self.field.step(1 / self.tick_rate,
+                                              (self.paddle_x, self.paddle_y, 15, self.paddle_height),
+                                              (self.opponent_paddle_x, self.opponent_paddle_y, 15,
+                                               self.paddle_height))
+        self.player_score += out_right
+        self.opponent_score += out_left
+        self.ticks += 1
+        return [self.snapshots.build(self.ticks, {
+            "paddle_y": self.paddle_y,
+            "balls": self.field.pack(),
+            "player_score": self.player_score,
+            "opponent_score": self.opponent_score
+        })]
+
+
+class TicTacToePolicy:
+    """Plays with the bitboard AI; host is X, client is O"""
+    tick_rate = 10
+
+    def __init__(self, is_host, board_size=3, win_length=None):
+        self.piece = X if is_host else O
+        self.board_size = board_size
+        self.win_length = win_length
+        self.board = BitBoard(board_size, win_length)
+        self.ai = TicTacToeAI(self.piece, time_budget=0.01)
+
+    def on_message(self, message):
+        if "history" in message:
+            self.board = BitBoard.from_history(message["history"], self.board_size, self.win_length)
+        elif "move" in message:
+            row, col = message["move"]
+            self.board.play(self.board.index(row, col), message["piece"])
+
+    def tick(self):
+        if self.board.game_over or self.board.piece_to_move() != self.piece:
+            return []
+        index = self.ai.choose_move(self.board)
+        self.board.play(index, self.piece)
+        row, col = self.board.position(index)
+        return [{"move": [row, col], "piece": self.piece, "history": self.board.encode_history()}]
+
+
+class SnakePolicy:
+    """Steers towards the food; the host also runs the snake simulation"""
+    tick_rate = 60
+    move_delay = 0.15
+    steps = DIRECTIONS
+
+    def __init__(self, is_host, grid_width=40, grid_height=30):
+        self.is_host = is_host
+        self.grid_width, self.grid_height = grid_width, grid_height
+        self.random = random.Random()
+
+        # The host runs the same deterministic core as SnakeGame; snake 0 is the host's
+        self.core = SnakeCore(grid_width, grid_height, self.random.getrandbits(32))
+        me, other = (0, 1) if is_host else (1, 0)
+        self.player_snake = cell_dicts(self.core.snakes[me])
+        self.opponent_snake = cell_dicts(self.core.snakes[other])
+        self.player_direction = self.core.directions[me]
+        self.opponent_direction = self.core.directions[other]
+        self.food = {"x": self.core.food[0], "y": self.core.food[1]}
+        self.player_score = 0
+        self.opponent_score = 0
+        self.player_alive = True
+        self.opponent_alive = True
+        self.game_over = False
+        self.last_move_time = time.perf_counter()
+
+        # Same field schedule as SnakeGame
+        self.ticks = 0
+        self.snapshots = snake_snapshots()
+
+    def on_message(self, message):
+        if "inputs" in message and message["inputs"]:
+            self.opponent_direction = message["inputs"][-1]["v"]
+        elif "direction" in message:
+            self.opponent_direction = message["direction"]
+        if not self.is_host:
+            # Hosts only send the slow fields when they change
+            for key in ("player_snake", "opponent_snake", "food", "player_alive", "game_over"):
+                if key in message:
+                    setattr(self, key, message[key])
+
+    def tick(self):
+        messages = []
+        direction = self._choose_direction()
+        if direction != self.player_direction:
+            self.player_direction = direction
+            messages.append({"direction": direction})
+
+        now = time.perf_counter()
+        if self.is_host and not self.game_over and now - self.last_move_time > self.move_delay:
+            self.last_move_time = now
+            messages.append(self._step())
+        return messages
+
+    def _choose_direction(self):
+        if not self.player_alive or not self.player_snake:
+            return self.player_direction
+
+        head = self.player_snake[0]
+        food = self.food or head
+        blocked = {(s["x"], s["y"]) for s in self.player_snake + self.opponent_snake}
+        options = []
+        for direction, (dx, dy) in self.steps.items():
+            if direction == OPPOSITE[self.player_direction]:
+                continue
+            x, y = head["x"] + dx, head["y"] + dy
+            if 0 <= x < self.grid_width and 0 <= y < self.grid_height and (x, y) not in blocked:
+                distance = abs(x - food["x"]) + abs(y - food["y"])
+                options.append((distance, self.random.random(), direction))
+        return min(options)[2] if options else self.player_direction
+
+    def _step(self):
+        core = self.core
+        core.step((self.player_direction, self.opponent_direction))
+        self.player_snake = cell_dicts(core.snakes[0])
+        self.opponent_snake = cell_dicts(core.snakes[1])
+        self.food = {"x": core.food[0], "y": core.food[1]} if core.food else None
+        self.player_score, self.opponent_score = core.scores
+        self.player_alive, self.opponent_alive = core.alive
+        self.game_over = core.game_over
+
+        self.ticks += 1
+        return self.snapshots.build(self.ticks, {
+            "player_snake": self.opponent_snake,
+            "opponent_snake": self.player_snake,
+            "food": self.food,
+            "player_score": self.opponent_score,
+            "opponent_score": self.player_score,
+            "player_alive": self.opponent_alive,
+            "opponent_alive": self.player_alive,
+            "game_over": self.game_over
+        }, flush=self.game_over)
+
+
+class ArenaPolicy:
+    """Guest steers at random; the host runs the full arena with AI snakes"""
+    tick_rate = 60
+    move_delay = 0.12
+
+    def __init__(self, is_host, board_size=(500, 500), bot_count=30, view=(40, 30)):
+        self.is_host = is_host
+        self.view = view
+        self.random = random.Random()
+        self.sequence = 0
+        self.last_move_time = time.perf_counter()
+        self.snapshot = None
+        if is_host:
+            self.arena = SnakeArena(*board_size)
+            self.guest_id = self.arena.add_snake("Guest")
+            for _ in range(bot_count):
+                self.arena.add_snake(is_bot=True)
+
+    def on_message(self, message):
+        if self.is_host:
+            for command in message.get("inputs", []):
+                self.arena.steer(self.guest_id, command["v"])
+        elif "arena" in message:
+            self.snapshot = message["arena"]
+
+    def tick(self):
+        now = time.perf_counter()
+        if now - self.last_move_time <= self.move_delay:
+            return []
+        self.last_move_time = now
+
+        if not self.is_host:
+            if self.random.random() > 0.2:
+                return []
+            self.sequence += 1
+            direction = self.random.choice(("up", "down", "left", "right"))
+            return [{"inputs": [{"s": self.sequence, "t": 0, "a": "turn", "v": direction}]}]
+
+        for snake_id in self.arena.step():
+            self.arena.respawn(snake_id)
+        return [{"arena": self.arena.view(self.guest_id, *self.view)}]
+
+
+# Keyed by registry index; local modes (vs AI) have nothing to play over the network
+POLICIES = {0: PongPolicy, 1: TicTacToePolicy, 2: SnakePolicy, 3: ArenaPolicy, 4: PongPartyPolicy,
+            5: lambda is_host: TicTacToePolicy(is_host, board_size=5, win_length=4)}
+
+
+class BotClient:
+    """One side of a hub match driven by a scripted policy.
+
+    ``protocols`` are the wire versions offered in the handshake; the load
+    generator narrows it to measure the JSON protocol.
+    """
+    def __init__(self, sock, is_host, username=None, stats=None, protocols=PROTOCOL_VERSIONS):
+        self.channel = Channel(sock)
+        self.is_host = is_host
+        self.username = username or f"bot-{random.randrange(10000)}"
+        self.opponent_username = None
+        self.stats = stats or BotStats()
+        self.protocols = protocols
+        self.pending = []
+        self.policy = None
+        self.game_index = None
+
+    @classmethod
+    def connect(cls, address, username=None, stats=None, timeout=5.0, protocols=PROTOCOL_VERSIONS):
+        sock = socket.create_connection(address, timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(sock, False, username, stats, protocols)
+
+    def send(self, message):
+        message = dict(message)
+        message[SENT_AT_KEY] = time.perf_counter()
+        sent = self.channel.bytes_sent
+        try:
+            self.channel.send(message)
+            self.stats.messages_sent += 1
+            self.stats.bytes_sent += self.channel.bytes_sent - sent
+        except ConnectionError:
+            # Peer has left; the caller decides whether that ends the match
+            raise
+        except OSError:
+            self.stats.send_errors += 1
+            raise
+
+    def read(self, timeout, limit=None):
+        """One read off the socket into ``pending``; False if nothing arrived in time"""
+        # A zero timeout still polls the socket once
+        self.channel.settimeout(max(0.0, timeout))
+        received = self.channel.bytes_received
+        try:
+            messages = self.channel.receive(4096, limit)
+        except (socket.timeout, BlockingIOError):
+            return False
+        self.stats.bytes_received += self.channel.bytes_received - received
+
+        for name, fields in messages:
+            if name is None:
+                if fields == "decode":
+                    self.stats.decode_errors += 1
+            elif name in METADATA_MESSAGES:
+                if SENT_AT_KEY in fields:
+                    self.stats.latencies.append(time.perf_counter() - fields[SENT_AT_KEY])
+            else:
+                self.pending.append(fields)
+        return True
+
+    def receive(self, timeout):
+        """Return the next message's fields, or None if nothing arrived in time"""
+        deadline = time.perf_counter() + timeout
+        while not self.pending:
+            if not self.read(deadline - time.perf_counter()):
+                return None
+
+        self.stats.messages_received += 1
+        return self.pending.pop(0)
+
+    def handshake(self, timeout=5.0):
+        self.send({"username": self.username, "protocol": list(self.protocols)})
+        deadline = time.perf_counter() + timeout
+        while True:
+            # Read one message at a time: what follows the peer's username may
+            # already be in the negotiated version
+            if not self.pending and not self.read(deadline - time.perf_counter(), limit=1):
+                raise TimeoutError("No username from peer")
+            while self.pending:
+                message = self.pending.pop(0)
+                if "username" in message:
+                    self.opponent_username = message["username"]
+                    self.channel.version = negotiate(message.get("protocol"), self.protocols)
+                    return self.opponent_username
+
+    def select_game(self, game_index):
+        self.send({"game_selection": game_index})
+        self._start(game_index)
+
+    def wait_for_selection(self, timeout=30.0):
+        while True:
+            message = self.receive(timeout)
+            if message is None:
+                raise TimeoutError("Peer never selected a game")
+            if "game_selection" in message:
+                self._start(message["game_selection"])
+                return self.game_index
+
+    def _start(self, game_index):
+        if game_index not in POLICIES:
+            raise ConnectionError(f"No bot policy for game {game_index}")
+        self.game_index = game_index
+        self.policy = POLICIES[game_index](self.is_host)
+
+    def play(self, duration, stop_event=None):
+        """Run the in-match loop at the policy's tick rate.
+
+        The match ends after ``duration`` seconds or when the peer leaves.
+        """
+        try:
+            self._play(duration, stop_event)
+        except ConnectionError:
+            pass
+
+    def _play(self, duration, stop_event):
+        interval = 1.0 / self.policy.tick_rate
+        end = time.perf_counter() + duration
+        next_tick = time.perf_counter()
+
+        while time.perf_counter() < end and not (stop_event and stop_event.is_set()):
+            # Drain everything that arrived since the last tick
+            message = self.receive(max(0.0, next_tick - time.perf_counter()))
+            while message is not None:
+                try:
+                    self.policy.on_message(message)
+                except (KeyError, TypeError, ValueError):
+                    self.stats.decode_errors += 1
+                message = self.receive(0.0) if self.pending else None
+
+            if time.perf_counter() < next_tick:
+                continue
+
+            start = time.perf_counter()
+            for outgoing in self.policy.tick():
+                self.send(outgoing)
+            self.stats.tick_times.append(time.perf_counter() - start)
+
+            next_tick += interval
+            # Don't try to catch up on ticks we missed entirely
+            if next_tick < time.perf_counter():
+                next_tick = time.perf_counter() + interval
+
+    def close(self):
+        try:
+            self.channel.close()
+        except OSError:
+            pass
+
+
+class BotHost:
+    """Listening side of a match, equivalent to pressing "Host Game"."""
+    def __init__(self, address=("127.0.0.1", 0)):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(address)
+        self.server.listen(1)
+        self.address = self.server.getsockname()
+
+    def accept(self, username=None, stats=None, timeout=30.0, protocols=PROTOCOL_VERSIONS):
+        self.server.settimeout(timeout)
+        connection, _ = self.server.accept()
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return BotClient(connection, True, username, stats, protocols)
+
+    def close(self):
+        self.server.close()
+
+
+def run_pair(game_index, duration, host_stats, client_stats, stop_event=None, target=None,
+             protocols=PROTOCOL_VERSIONS):
+    """Play one bot-vs-bot match over loopback (or against an existing host)"""
+    host = None
+    threads = []
+    try:
+        if target is None:
+            host = BotHost()
+            target = host.address
+
+            def host_side():
+                bot = None
+                try:
+                    bot = host.accept(stats=host_stats, protocols=protocols)
+                    bot.handshake()
+                    bot.select_game(game_index)
+                    bot.play(duration, stop_event)
+                except (OSError, TimeoutError, ConnectionError):
+                    host_stats.failed = True
+                finally:
+                    if bot:
+                        bot.close()
+
+            threads.append(threading.Thread(target=host_side, daemon=True))
+            threads[-1].start()
+
+        bot = None
+        try:
+            bot = BotClient.connect(target, stats=client_stats, protocols=protocols)
+            bot.handshake()
+            bot.wait_for_selection()
+            bot.play(duration, stop_event)
+        except (OSError, TimeoutError, ConnectionError):
+            client_stats.failed = True
+        finally:
+            if bot:
+                bot.close()
+
+        for thread in threads:
+            thread.join(duration + 5)
+    finally:
+        if host:
+            host.close()
@@ -0,0 +1,115 @@
+"""Per-player queues of timestamped input commands.
+
+Input handlers push commands as they happen and the simulation consumes
+them on its own tick, so two quick key presses inside one tick are both
+kept instead of the second overwriting the first. The pending commands are
+also what goes over the network, and every applied command is logged with
+its tick so a match's inputs can be replayed exactly.
+"""
+import threading
+from collections import deque
+
+
+class InputCommand:
+    __slots__ = ("sequence", "timestamp", "action", "value")
+
+    def __init__(self, sequence, timestamp, action, value=None):
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.action = action
+        self.value = value
+
+    def to_dict(self):
+        return {"s": self.sequence, "t": self.timestamp, "a": self.action, "v": self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(int(data["s"]), data.get("t", 0), data["a"], data.get("v"))
+
+    def __repr__(self):
+        return f"InputCommand({self.sequence}, {self.timestamp}, {self.action!r}, {self.value!r})"
+
+
+class InputQueue:
+    """Validated, ordered input commands for one player.
+
+    ``validate(command, last_value)`` decides whether a command is allowed
+    given the value of the last accepted one, so validation follows what is
+    already queued rather than what the simulation has applied so far.
+    """
+    def __init__(self, validate=None, initial=None, max_pending=4):
+        self.validate = validate
+        self.last_value = initial
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.outgoing = []
+        self.log = []
+        self.next_sequence = 0
+        self.last_remote_sequence = -1
+        # Remote commands arrive on the network thread
+        self.lock = threading.Lock()
+
+    def _accept(self, command):
+        if self.validate and not self.validate(command, self.last_value):
+            return False
+        if len(self.pending) >= self.max_pending:
+            # A long backlog would only add latency, and dropping from the
+            # middle would break the validation chain, so refuse new input
+            return False
+        self.pending.append(command)
+        self.last_value = command.value
+        return True
+
+    def push(self, action, value=None, timestamp=0, send=True):
+        """Queue a command; returns it, or None if it was rejected.
+
+        Commands with ``send`` set are also held for ``take_outgoing``.
+        """
+        with self.lock:
+            command = InputCommand(self.next_sequence, timestamp, action, value)
+            if not self._accept(command):
+                return None
+            self.next_sequence += 1
+            if send:
+                self.outgoing.append(command)
+            return command
+
+    def receive(self, payload):
+        """Queue commands sent by the remote player, ignoring duplicates and bad data"""
+        accepted = 0
+        with self.lock:
+            for data in payload:
+                try:
+                    command = InputCommand.from_dict(data)
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if command.sequence <= self.last_remote_sequence:
+                    continue
+                self.last_remote_sequence = command.sequence
+                accepted += self._accept(command)
+        return accepted
+
+    def pop(self, tick, until=None):
+        """Next command stamped at or before ``until``, logged against ``tick``"""
+        with self.lock:
+            if not self.pending:
+                return None
+            if until is not None and self.pending[0].timestamp > until:
+                return None
+            command = self.pending.popleft()
+        self.log.append((tick, command))
+        return command
+
+    def pop_all(self, tick, until=None):
+        commands = []
+        command = self.pop(tick, until)
+        while command is not None:
+            commands.append(command)
+            command = self.pop(tick, until)
+        return commands
+
+    def take_outgoing(self):
+        """Local commands not yet sent, in wire format"""
+        with self.lock:
+            outgoing, self.outgoing = self.outgoing, []
+        return [command.to_dict() for command in outgoing]
@@ -0,0 +1,99 @@
+"""Ramp up concurrent bot matches over loopback and report capacity numbers.
+
+Example:
+    python load_generator.py --pairs 50 --ramp 10 --duration 30 --game mixed
+"""
+import argparse
+import threading
+import time
+
+from hub_bots import GAMES, POLICIES, BotStats, percentile, run_pair
+from net_proxy import parse_address
+from wire import PROTOCOL_VERSIONS
+
+GAME_CHOICES = {"pong": 0, "tictactoe": 1, "snake": 2, "arena": 3, "party": 4, "tictactoe5": 5}
+
+
+def summarize(label, stats_list, elapsed):
+    tick_times = [t for s in stats_list for t in s.tick_times]
+    latencies = [t for s in stats_list for t in s.latencies]
+    sent = sum(s.messages_sent for s in stats_list)
+    received = sum(s.messages_received for s in stats_list)
+    errors = sum(s.decode_errors + s.send_errors for s in stats_list)
+    failed = sum(1 for s in stats_list if s.failed)
+    bytes_sent = sum(s.bytes_sent for s in stats_list)
+
+    def ms(value):
+        return f"{value * 1000:7.3f}"
+
+    print(f"\n== {label} ({len(stats_list)} bots) ==")
+    print(f"  messages: {sent} sent, {received} received, "
+          f"{sent / elapsed:.0f} msg/s, {bytes_sent / elapsed / 1024:.1f} KiB/s")
+    print(f"  tick ms:    p50 {ms(percentile(tick_times, 50))}  p95 {ms(percentile(tick_times, 95))}  "
+          f"p99 {ms(percentile(tick_times, 99))}  max {ms(max(tick_times, default=0.0))}")
+    print(f"  latency ms: p50 {ms(percentile(latencies, 50))}  p95 {ms(percentile(latencies, 95))}  "
+          f"p99 {ms(percentile(latencies, 99))}  max {ms(max(latencies, default=0.0))}")
+    error_rate = errors / max(1, sent + received)
+    print(f"  errors: {errors} ({error_rate:.3%}), failed bots: {failed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the gaming hub protocol with bot pairs")
+    parser.add_argument("--pairs", type=int, default=10, help="concurrent bot pairs to reach")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds taken to start all pairs")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds each match lasts")
+    parser.add_argument("--game", choices=list(GAME_CHOICES) + ["mixed"], default="mixed")
+    parser.add_argument("--target", type=parse_address, default=None,
+                        help="HOST:PORT of an existing host; only client bots are started")
+    parser.add_argument("--protocol", type=int, choices=PROTOCOL_VERSIONS, default=max(PROTOCOL_VERSIONS),
+                        help="highest wire protocol version the bots offer (1 is plain JSON)")
+    args = parser.parse_args()
+    protocols = tuple(version for version in PROTOCOL_VERSIONS if version <= args.protocol)
+
+    stop_event = threading.Event()
+    results = []
+    threads = []
+    start = time.perf_counter()
+
+    try:
+        for i in range(args.pairs):
+            if args.game == "mixed":
+                game_index = list(POLICIES)[i % len(POLICIES)]
+            else:
+                game_index = GAME_CHOICES[args.game]
+
+            host_stats, client_stats = BotStats(), BotStats()
+            results.append((game_index, host_stats, client_stats))
+            thread = threading.Thread(
+                target=run_pair,
+                args=(game_index, args.duration, host_stats, client_stats, stop_event, args.target,
+                      protocols),
+                daemon=True)
+            thread.start()
+            threads.append(thread)
+
+            if args.pairs > 1:
+                time.sleep(args.ramp / (args.pairs - 1))
+            print(f"\rstarted {i + 1}/{args.pairs} pairs", end="", flush=True)
+
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in threads:
+            thread.join(5)
+
+    elapsed = time.perf_counter() - start
+    print()
+    for game_index, name in enumerate(GAMES):
+        hosts = [h for g, h, _ in results if g == game_index]
+        clients = [c for g, _, c in results if g == game_index]
+        if not hosts:
+            continue
+        if args.target is None:
+            summarize(f"{name} hosts", hosts, elapsed)
+        summarize(f"{name} clients", clients, elapsed)
+
+
+if __name__ == "__main__":
+    main()
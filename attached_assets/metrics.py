@@ -0,0 +1,349 @@
+"""Counters, gauges and histograms for long-running hubs, served to Prometheus.
+
+Recording is meant for hot paths: every thread adds into its own cell, so
+``inc`` and ``observe`` never take a lock and never contend with another
+thread. Cells are only summed when the endpoint is scraped.
+
+Start the endpoint with ``start_server(port)`` and point Prometheus (or
+curl) at ``http://127.0.0.1:<port>/metrics``.
+"""
+import bisect
+import socket
+import struct
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.children = {}
+        self.lock = threading.Lock()
+        if not self.label_names:
+            self.default = self.labels()
+
+    def labels(self, *values, **named):
+        """Child for one combination of label values; cache it on hot paths"""
+        if named:
+            values = tuple(named[name] for name in self.label_names)
+        key = tuple(str(v) for v in values)
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.get(key)
+                if child is None:
+                    child = self.children[key] = self.new_child()
+        return child
+
+    def remove(self, *values):
+        with self.lock:
+            self.children.pop(tuple(str(v) for v in values), None)
+
+    def new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) tuples for the exposition"""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(self.label_names, values, extra)} "
+                         f"{format_value(value)}")
+        return "\n".join(lines)
+
+
+class _ShardedChild:
+    """Per-thread cells: each thread only ever writes its own list"""
+    def __init__(self, width):
+        self.width = width
+        self.cells = {}
+
+    def cell(self):
+        ident = threading.get_ident()
+        cell = self.cells.get(ident)
+        if cell is None:
+            # Inserting a new key is atomic under the GIL; only this thread uses it
+            cell = self.cells[ident] = [0] * self.width
+        return cell
+
+    def totals(self):
+        totals = [0] * self.width
+        for cell in list(self.cells.values()):
+            for i, value in enumerate(cell):
+                totals[i] += value
+        return totals
+
+
+class CounterChild(_ShardedChild):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount=1):
+        self.cell()[0] += amount
+
+    @property
+    def value(self):
+        return self.totals()[0]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def new_child(self):
+        return CounterChild()
+
+    def inc(self, amount=1):
+        self.default.inc(amount)
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            yield "", values, (), child.value
+
+
+class HistogramChild(_ShardedChild):
+    def __init__(self, buckets):
+        # One count per bucket plus +Inf, then the running sum
+        super().__init__(len(buckets) + 2)
+        self.buckets = buckets
+
+    def observe(self, value):
+        cell = self.cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labels)
+
+    def new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.default.observe(value)
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            totals = child.totals()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), totals):
+                cumulative += count
+                yield "_bucket", values, (("le", format_value(bound)),), cumulative
+            yield "_sum", values, (), totals[-1]
+            yield "_count", values, (), cumulative
+
+
+class GaugeChild:
+    def __init__(self):
+        self.value = 0
+        self.function = None
+        self.lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Read the value from ``function()`` at scrape time instead"""
+        self.function = function
+
+    def get(self):
+        if self.function is not None:
+            return self.function()
+        return self.value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def new_child(self):
+        return GaugeChild()
+
+    def set(self, value):
+        self.default.set(value)
+
+    def set_function(self, function):
+        self.default.set_function(function)
+
+    def samples(self):
+        for values, child in list(self.children.items()):
+            value = child.get()
+            if value is not None:
+                yield "", values, (), value
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            # Modules can be re-imported (e.g. when run as a script); keep the first
+            return self.metrics.setdefault(metric.name, metric)
+
+    def render(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name, help_text, labels=()):
+    return REGISTRY.register(Counter(name, help_text, labels))
+
+
+def gauge(name, help_text, labels=()):
+    return REGISTRY.register(Gauge(name, help_text, labels))
+
+
+def histogram(name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, help_text, labels, buckets))
+
+
+# Hub metrics
+TICK_SECONDS = histogram("hub_tick_seconds", "Time spent in one game update", ("game",))
+FRAME_SECONDS = histogram("hub_frame_seconds", "Time spent updating and rendering one frame", ("game",))
+# Counted by wire.Channel, one per typed message, however TCP splits or coalesces them
+MESSAGES_SENT = counter("hub_messages_sent_total", "Messages sent per connection", ("peer",))
+MESSAGES_RECEIVED = counter("hub_messages_received_total", "Messages received per connection", ("peer",))
+# Socket calls: one read may hold several messages or part of one
+SOCKET_WRITES = counter("hub_socket_writes_total", "Socket send calls per connection", ("peer",))
+SOCKET_READS = counter("hub_socket_reads_total", "Non-empty socket reads per connection", ("peer",))
+BYTES_SENT = counter("hub_bytes_sent_total", "Bytes sent per connection", ("peer",))
+BYTES_RECEIVED = counter("hub_bytes_received_total", "Bytes received per connection", ("peer",))
+DROPPED_MESSAGES = counter("hub_dropped_messages_total", "Received messages that could not be used",
+                           ("game", "reason"))
+RTT_SECONDS = gauge("hub_rtt_seconds", "Smoothed TCP round-trip time per connection", ("peer",))
+ACTIVE_GAMES = gauge("hub_active_games", "Matches currently being played", ("game",))
+THREADS = gauge("hub_threads", "Live Python threads")
+THREADS.set_function(threading.active_count)
+
+# Labelled by connection; their children go when the connection closes
+PEER_METRICS = (MESSAGES_SENT, MESSAGES_RECEIVED, SOCKET_WRITES, SOCKET_READS, BYTES_SENT, BYTES_RECEIVED,
+                RTT_SECONDS)
+
+
+def tcp_rtt(sock):
+    """Kernel's smoothed RTT estimate in seconds, or None where TCP_INFO isn't available"""
+    if not sys.platform.startswith("linux") or not hasattr(socket, "TCP_INFO"):
+        return None
+    try:
+        info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, 104)
+        # struct tcp_info: 8 single-byte fields, then u32s; tcpi_rtt (µs) is the 16th
+        return struct.unpack_from("I", info, 8 + 15 * 4)[0] / 1e6
+    except (OSError, struct.error):
+        return None
+
+
+class MeteredSocket:
+    """Wraps a connected socket and counts its traffic; everything else is passed through"""
+    def __init__(self, sock):
+        self.sock = sock
+        try:
+            host, port = sock.getpeername()[:2]
+            self.peer = f"{host}:{port}"
+        except (OSError, ValueError):
+            # Not an IP socket (e.g. a socketpair in tests)
+            self.peer = "unknown"
+        # Look the children up once; send and recv run every frame
+        # Message counts come from the Channel on top, which is what splits the stream
+        self.messages_sent = MESSAGES_SENT.labels(self.peer)
+        self.messages_received = MESSAGES_RECEIVED.labels(self.peer)
+        self.writes = SOCKET_WRITES.labels(self.peer)
+        self.reads = SOCKET_READS.labels(self.peer)
+        self.bytes_sent = BYTES_SENT.labels(self.peer)
+        self.bytes_received = BYTES_RECEIVED.labels(self.peer)
+        RTT_SECONDS.labels(self.peer).set_function(lambda: tcp_rtt(self.sock))
+
+    def send(self, data, *args):
+        sent = self.sock.send(data, *args)
+        self.writes.inc()
+        self.bytes_sent.inc(sent)
+        return sent
+
+    def sendall(self, data, *args):
+        self.sock.sendall(data, *args)
+        self.writes.inc()
+        self.bytes_sent.inc(len(data))
+
+    def recv(self, size, *args):
+        data = self.sock.recv(size, *args)
+        if data:
+            self.reads.inc()
+            self.bytes_received.inc(len(data))
+        return data
+
+    def close(self):
+        # Reconnecting clients get a new port each time; don't keep their series forever
+        for metric in PEER_METRICS:
+            metric.remove(self.peer)
+        self.sock.close()
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the hub's console
+        pass
+
+
+def start_server(port, host="127.0.0.1"):
+    """Serve /metrics on a daemon thread; returns the server so callers can shut it down"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
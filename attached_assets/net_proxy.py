@@ -0,0 +1,462 @@
+"""Local network-impairment proxy for testing the hub under bad conditions.
+
+Sits between two hub instances on one machine and adds latency, jitter,
+loss, reordering and bandwidth limits. TCP streams can't lose or reorder
+bytes, so on TCP a "lost" segment is modelled the way the kernel would
+recover it: delivered late after a retransmission timeout, holding back
+everything behind it. UDP datagrams are really dropped and reordered.
+
+Example (host on 5555, client connects to 127.0.0.1:6000):
+    python net_proxy.py --listen 6000 --target 127.0.0.1:5555 --scenario cross-country
+"""
+import argparse
+import heapq
+import itertools
+import random
+import socket
+import threading
+import time
+
+
+class Impairment:
+    """One set of link conditions, applied per direction"""
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, distribution="normal", loss=0.0,
+                 reorder=0.0, bandwidth_kbps=None, retransmit_ms=200.0):
+        if distribution not in ("constant", "uniform", "normal", "pareto"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.loss = loss
+        self.reorder = reorder
+        self.bandwidth_kbps = bandwidth_kbps
+        self.retransmit_ms = retransmit_ms
+
+    def delay(self, rng):
+        """One-way delay in seconds for the next packet"""
+        if self.distribution == "constant" or not self.jitter_ms:
+            extra = 0.0
+        elif self.distribution == "uniform":
+            extra = rng.uniform(-self.jitter_ms, self.jitter_ms)
+        elif self.distribution == "normal":
+            extra = rng.gauss(0.0, self.jitter_ms)
+        else:
+            # Heavy-tailed: mostly small spikes with the occasional big one
+            extra = self.jitter_ms * (rng.paretovariate(2.5) - 1.0)
+        return max(0.0, self.latency_ms + extra) / 1000.0
+
+    def transmit_time(self, size):
+        if not self.bandwidth_kbps:
+            return 0.0
+        return size * 8 / (self.bandwidth_kbps * 1000.0)
+
+
+class Scenario:
+    """A timed sequence of (seconds, Impairment) phases"""
+    def __init__(self, phases, loop=False):
+        self.phases = list(phases)
+        self.loop = loop
+        self.total = sum(duration for duration, _ in self.phases)
+
+    def profile_at(self, elapsed):
+        if self.loop and self.total > 0:
+            elapsed %= self.total
+        for duration, profile in self.phases:
+            if elapsed < duration:
+                return profile
+            elapsed -= duration
+        return self.phases[-1][1]
+
+
+# Scripted scenarios; RTT is twice the one-way latency since both directions are impaired
+SCENARIOS = {
+    "lan": Scenario([(float("inf"), Impairment(latency_ms=0.5, jitter_ms=0.2))]),
+    "wifi": Scenario([(float("inf"), Impairment(latency_ms=5, jitter_ms=8, distribution="pareto",
+                                                loss=0.005))]),
+    "cross-country": Scenario([(float("inf"), Impairment(latency_ms=50, jitter_ms=5, loss=0.02,
+                                                         reorder=0.01))]),
+    "mobile": Scenario([(float("inf"), Impairment(latency_ms=60, jitter_ms=30, distribution="pareto",
+                                                  loss=0.03, reorder=0.02, bandwidth_kbps=512))]),
+    "degrading": Scenario([
+        (10, Impairment(latency_ms=10, jitter_ms=2)),
+        (10, Impairment(latency_ms=50, jitter_ms=10, loss=0.01)),
+        (10, Impairment(latency_ms=150, jitter_ms=40, loss=0.05, bandwidth_kbps=256)),
+    ], loop=True),
+}
+
+
+def as_scenario(conditions):
+    if isinstance(conditions, Scenario):
+        return conditions
+    if isinstance(conditions, str):
+        return SCENARIOS[conditions]
+    return Scenario([(float("inf"), conditions or Impairment())])
+
+
+class ProxyStats:
+    def __init__(self):
+        self.packets = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.retransmitted = 0
+        self.reordered = 0
+
+
+class _DelayLine:
+    """Releases queued items at their scheduled time from a background thread"""
+    def __init__(self, deliver):
+        self.deliver = deliver
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, when, item):
+        with self.condition:
+            heapq.heappush(self.queue, (when, next(self.counter), item))
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.closed:
+                    if self.queue:
+                        wait = self.queue[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self.condition.wait(wait)
+                    else:
+                        self.condition.wait()
+                if self.closed:
+                    return
+                _, _, item = heapq.heappop(self.queue)
+            try:
+                self.deliver(item)
+            except OSError:
+                return
+
+
+class _TcpPipe:
+    """One direction of a proxied TCP connection.
+
+    ``on_done`` is called once, from the delivery thread, after the
+    half-close has been passed on or the destination has gone away.
+    """
+    def __init__(self, source, destination, scenario, start_time, rng, stats, on_done):
+        self.source = source
+        self.destination = destination
+        self.scenario = scenario
+        self.start_time = start_time
+        self.rng = rng
+        self.stats = stats
+        self.on_done = on_done
+        self.done = False
+        self.last_delivery = 0.0
+        self.link_free = 0.0
+        self.delay_line = _DelayLine(self._deliver)
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self):
+        while True:
+            try:
+                data = self.source.recv(65536)
+            except OSError:
+                data = b""
+
+            now = time.monotonic()
+            if not data:
+                # Half-close after everything already in flight
+                self.delay_line.put(max(now, self.last_delivery), None)
+                return
+
+            profile = self.scenario.profile_at(now - self.start_time)
+            self.link_free = max(self.link_free, now) + profile.transmit_time(len(data))
+            when = self.link_free + profile.delay(self.rng)
+            if profile.loss and self.rng.random() < profile.loss:
+                when += profile.retransmit_ms / 1000.0
+                self.stats.retransmitted += 1
+
+            # Byte stream order is preserved, so a late segment delays the rest
+            when = max(when, self.last_delivery)
+            self.last_delivery = when
+            self.stats.packets += 1
+            self.stats.bytes += len(data)
+            self.delay_line.put(when, data)
+
+    def _deliver(self, data):
+        if data is None:
+            try:
+                self.destination.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            self.delay_line.close()
+            self._finish()
+            return
+        try:
+            self.destination.sendall(data)
+        except OSError:
+            self._finish()
+            raise
+
+    def _finish(self):
+        if not self.done:
+            self.done = True
+            self.on_done()
+
+    def close(self):
+        self.delay_line.close()
+
+
+class _TcpConnection:
+    """Both directions of one proxied connection; closes its sockets once both are done"""
+    def __init__(self, client, upstream, proxy):
+        self.proxy = proxy
+        self.sockets = (client, upstream)
+        self.lock = threading.Lock()
+        self.open_pipes = 2
+        self.pipes = [
+            _TcpPipe(client, upstream, proxy.scenario, proxy.start_time, proxy.rng, proxy.stats, self._pipe_done),
+            _TcpPipe(upstream, client, proxy.scenario, proxy.start_time, proxy.rng, proxy.stats, self._pipe_done),
+        ]
+
+    def _pipe_done(self):
+        with self.lock:
+            self.open_pipes -= 1
+            finished = self.open_pipes == 0
+        if finished:
+            self.close()
+            self.proxy.forget(self)
+
+    def close(self):
+        for pipe in self.pipes:
+            pipe.close()
+        for sock in self.sockets:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+class NetworkProxy:
+    """Impaired TCP relay from a local port to a target address.
+
+    Usable from tests as a context manager:
+
+        with NetworkProxy(("127.0.0.1", host_port), "cross-country") as proxy:
+            sock = socket.create_connection(proxy.address)
+    """
+    def __init__(self, target, conditions=None, listen=("127.0.0.1", 0), seed=None):
+        self.target = target
+        self.scenario = as_scenario(conditions)
+        self.rng = random.Random(seed)
+        self.stats = ProxyStats()
+        self.start_time = time.monotonic()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(listen)
+        self.server.listen(8)
+        self.address = self.server.getsockname()
+        self.running = False
+        # Live connections; each one removes itself when both directions have closed
+        self.connections = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.start_time = time.monotonic()
+        self.thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _accept_loop(self):
+        self.server.settimeout(0.2)
+        while self.running:
+            try:
+                client, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                upstream = socket.create_connection(self.target, timeout=5.0)
+                upstream.settimeout(None)
+            except OSError:
+                client.close()
+                continue
+
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _TcpConnection(client, upstream, self)
+            with self.lock:
+                self.connections.add(connection)
+
+    def forget(self, connection):
+        with self.lock:
+            self.connections.discard(connection)
+
+    def stop(self):
+        self.running = False
+        self.server.close()
+        with self.lock:
+            connections, self.connections = self.connections, set()
+        for connection in connections:
+            connection.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class UdpProxy:
+    """Impaired UDP relay; datagrams are genuinely dropped and reordered"""
+    def __init__(self, target, conditions=None, listen=("127.0.0.1", 0), seed=None):
+        self.target = target
+        self.scenario = as_scenario(conditions)
+        self.rng = random.Random(seed)
+        self.stats = ProxyStats()
+        self.start_time = time.monotonic()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind(listen)
+        self.address = self.server.getsockname()
+        self.running = False
+        self.upstreams = {}
+        self.link_free = {}
+        self.delay_line = _DelayLine(self._deliver)
+        self.threads = []
+
+    def start(self):
+        self.running = True
+        self.start_time = time.monotonic()
+        self._spawn(self._client_loop)
+        return self
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def _client_loop(self):
+        self.server.settimeout(0.2)
+        while self.running:
+            try:
+                data, client = self.server.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            upstream = self.upstreams.get(client)
+            if upstream is None:
+                # One upstream socket per client so replies find their way back
+                upstream = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                upstream.connect(self.target)
+                self.upstreams[client] = upstream
+                self._spawn(self._upstream_loop, upstream, client)
+            self._schedule(data, upstream.send, ("up", client))
+
+    def _upstream_loop(self, upstream, client):
+        upstream.settimeout(0.2)
+        while self.running:
+            try:
+                data = upstream.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self._schedule(data, lambda payload: self.server.sendto(payload, client), ("down", client))
+
+    def _schedule(self, data, send, direction):
+        now = time.monotonic()
+        profile = self.scenario.profile_at(now - self.start_time)
+        self.stats.packets += 1
+
+        if profile.loss and self.rng.random() < profile.loss:
+            self.stats.dropped += 1
+            return
+
+        link_free = max(self.link_free.get(direction, 0.0), now) + profile.transmit_time(len(data))
+        self.link_free[direction] = link_free
+        when = link_free + profile.delay(self.rng)
+        if profile.reorder and self.rng.random() < profile.reorder:
+            # Hold this datagram back long enough for later ones to overtake it
+            when += max(profile.latency_ms, 10.0) / 1000.0
+            self.stats.reordered += 1
+
+        self.stats.bytes += len(data)
+        self.delay_line.put(when, (send, data))
+
+    def _deliver(self, item):
+        send, data = item
+        try:
+            send(data)
+        except OSError:
+            pass
+
+    def stop(self):
+        self.running = False
+        self.delay_line.close()
+        self.server.close()
+        for upstream in self.upstreams.values():
+            upstream.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def parse_address(value):
+    """HOST:PORT (or just :PORT / PORT for localhost) as a socket address"""
+    host, _, port = value.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relay hub traffic with simulated network conditions")
+    parser.add_argument("--listen", type=int, required=True, help="local port to accept connections on")
+    parser.add_argument("--target", type=parse_address, required=True, help="HOST:PORT of the hub host")
+    parser.add_argument("--udp", action="store_true", help="relay UDP datagrams instead of TCP")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), help="use a scripted scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="one-way latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter in ms")
+    parser.add_argument("--distribution", default="normal",
+                        choices=["constant", "uniform", "normal", "pareto"])
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss probability (0-1)")
+    parser.add_argument("--reorder", type=float, default=0.0, help="reorder probability (0-1, UDP only)")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bandwidth cap in kbit/s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    conditions = args.scenario or Impairment(args.latency, args.jitter, args.distribution,
+                                             args.loss, args.reorder, args.bandwidth)
+    proxy_class = UdpProxy if args.udp else NetworkProxy
+    proxy = proxy_class(args.target, conditions, listen=("0.0.0.0", args.listen), seed=args.seed)
+    proxy.start()
+    print(f"Relaying {proxy.address[1]} -> {args.target[0]}:{args.target[1]} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(5)
+            stats = proxy.stats
+            print(f"packets: {stats.packets}  bytes: {stats.bytes}  dropped: {stats.dropped}  "
+                  f"retransmitted: {stats.retransmitted}  reordered: {stats.reordered}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Deterministic rules for Pong and Snake, free of pygame.
+
+Every piece of state is an integer: Pong's ball uses 16.16 fixed point so
+sub-pixel velocities come out identical on every machine, and randomness
+comes from a seeded xorshift generator rather than the clock or Python's
+``random`` (whose algorithms may change between versions). Given the same
+seed and the same inputs per tick, two cores produce the same
+``state_hash()`` every tick, so replays, bots, servers and benchmarks can
+step them at full speed and spot a desync on the tick it happens.
+
+    python sim_core.py --ticks 100000
+"""
+import argparse
+import struct
+import time
+import zlib
+
+FRACTION_BITS = 16
+ONE = 1 << FRACTION_BITS
+
+LEFT, RIGHT = 0, 1
+
+
+def to_fixed(value):
+    return int(round(value * ONE))
+
+
+def to_pixels(value):
+    # Arithmetic shift floors negatives too, so this never depends on float rounding
+    return value >> FRACTION_BITS
+
+
+class Rng:
+    """32-bit xorshift; tiny, fast and identical everywhere"""
+    def __init__(self, seed):
+        self.state = (seed & 0xFFFFFFFF) or 0x9E3779B9
+
+    def next(self):
+        x = self.state
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        self.state = x
+        return x
+
+    def below(self, limit):
+        return self.next() % limit
+
+    def between(self, low, high):
+        return low + self.below(high - low)
+
+
+class PongCore:
+    """Pong rules; the host's paddle is on the left.
+
+    Paddle moves are -1 (up), 0 or 1 (down) per tick.
+    """
+    def __init__(self, width=800, height=600, seed=0, paddle_width=15, paddle_height=100,
+                 paddle_speed=8, paddle_margin=50, ball_size=15, ball_speed=7):
+        self.width = width
+        self.height = height
+        self.paddle_width = paddle_width
+        self.paddle_height = paddle_height
+        self.paddle_speed = paddle_speed
+        self.ball_size = ball_size
+        self.ball_speed = ball_speed
+        self.rng = Rng(seed)
+        self.tick = 0
+
+        # Paddle tops in whole pixels
+        self.paddle_x = (paddle_margin, width - paddle_margin - paddle_width)
+        self.paddle_y = [height // 2 - paddle_height // 2] * 2
+        self.scores = [0, 0]
+
+        # The first serve heads away from the host
+        self.ball_vx = to_fixed(ball_speed)
+        self.serve()
+
+    def serve(self):
+        """Ball back to the centre at a seeded angle, keeping its horizontal direction"""
+        self.ball_x = to_fixed(self.width // 2 - self.ball_size // 2)
+        self.ball_y = to_fixed(self.height // 2 - self.ball_size // 2)
+        speed = self.rng.between(to_fixed(self.ball_speed - 2), to_fixed(self.ball_speed + 1))
+        self.ball_vy = speed if self.rng.below(2) else -speed
+
+    def step(self, left_move=0, right_move=0, move_ball=True):
+        self.tick += 1
+        for side, move in ((LEFT, left_move), (RIGHT, right_move)):
+            if move:
+                y = self.paddle_y[side] + move * self.paddle_speed
+                self.paddle_y[side] = min(max(y, 0), self.height - self.paddle_height)
+        if move_ball:
+            self.step_ball()
+
+    def step_ball(self):
+        size = to_fixed(self.ball_size)
+        self.ball_x += self.ball_vx
+        self.ball_y += self.ball_vy
+
+        # Walls: only turn around when heading into the wall, so an overlap can't stick
+        if (self.ball_y <= 0 and self.ball_vy < 0) or \
+                (self.ball_y + size >= to_fixed(self.height) and self.ball_vy > 0):
+            self.ball_vy = -self.ball_vy
+
+        # Paddles: the same overlap test as pygame's colliderect, in fixed point
+        side = LEFT if self.ball_vx < 0 else RIGHT
+        px, py = to_fixed(self.paddle_x[side]), to_fixed(self.paddle_y[side])
+        if (self.ball_x < px + to_fixed(self.paddle_width) and self.ball_x + size > px and
+                self.ball_y < py + to_fixed(self.paddle_height) and self.ball_y + size > py):
+            self.ball_vx = -self.ball_vx
+
+        # Scoring; the next serve heads towards the side that just scored
+        if self.ball_x <= 0:
+            self.scores[RIGHT] += 1
+            self.ball_vx = -self.ball_vx
+            self.serve()
+        elif self.ball_x + size >= to_fixed(self.width):
+            self.scores[LEFT] += 1
+            self.ball_vx = -self.ball_vx
+            self.serve()
+
+    def ball_position(self):
+        return to_pixels(self.ball_x), to_pixels(self.ball_y)
+
+    def state_hash(self):
+        return zlib.crc32(struct.pack(
+            "<IqqqqiiiiI", self.tick, self.ball_x, self.ball_y, self.ball_vx, self.ball_vy,
+            self.paddle_y[LEFT], self.paddle_y[RIGHT], self.scores[LEFT], self.scores[RIGHT],
+            self.rng.state))
+
+
+DIRECTIONS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+
+class SnakeCore:
+    """Two-player Snake rules; snake 0 belongs to the host.
+
+    Snakes are lists of (x, y) cells, head first. Each tick the host's snake
+    moves first, then the guest's. A snake that would hit a wall or any body
+    dies where it is; the game ends when both are dead.
+    """
+    def __init__(self, grid_width=40, grid_height=30, seed=0):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.rng = Rng(seed)
+        self.tick = 0
+
+        far_x, far_y = grid_width - 5, grid_height - 5
+        self.snakes = [[(5, 5), (4, 5), (3, 5)],
+                       [(far_x, far_y), (far_x + 1, far_y), (far_x + 2, far_y)]]
+        self.directions = ["right", "left"]
+        self.alive = [True, True]
+        self.scores = [0, 0]
+        self.game_over = False
+        self.food = self.place_food()
+
+    def place_food(self):
+        occupied = set(self.snakes[0]) | set(self.snakes[1])
+        if len(occupied) >= self.grid_width * self.grid_height:
+            return None
+        while True:
+            food = (self.rng.below(self.grid_width), self.rng.below(self.grid_height))
+            if food not in occupied:
+                return food
+
+    def step(self, directions=None):
+        """Advance one move; ``directions`` optionally turns each snake first"""
+        self.tick += 1
+        if directions:
+            for index, direction in enumerate(directions):
+                if direction in DIRECTIONS:
+                    self.directions[index] = direction
+
+        for index, snake in enumerate(self.snakes):
+            if not self.alive[index]:
+                continue
+            dx, dy = DIRECTIONS[self.directions[index]]
+            head = (snake[0][0] + dx, snake[0][1] + dy)
+            other = self.snakes[1 - index]
+            if not (0 <= head[0] < self.grid_width and 0 <= head[1] < self.grid_height) or \
+                    head in snake or head in other:
+                self.alive[index] = False
+                continue
+
+            snake.insert(0, head)
+            if head == self.food:
+                self.scores[index] += 1
+                self.food = self.place_food()
+            else:
+                snake.pop()
+
+        if not any(self.alive):
+            self.game_over = True
+
+    def state_hash(self):
+        cells = [value for snake in self.snakes for cell in snake for value in cell]
+        food = self.food or (-1, -1)
+        return zlib.crc32(struct.pack(
+            f"<IiiBBBBiiiiI{len(cells)}i", self.tick, food[0], food[1],
+            DIRECTION_CODES[self.directions[0]], DIRECTION_CODES[self.directions[1]],
+            self.alive[0], self.alive[1], self.scores[0], self.scores[1],
+            len(self.snakes[0]), len(self.snakes[1]), self.rng.state, *cells))
+
+
+def cell_dicts(snake):
+    """Snake cells in the hub's wire format"""
+    return [{"x": x, "y": y} for x, y in snake]
+
+
+
+def pong_script(seed):
+    """Random paddle moves from their own seeded stream"""
+    rng = Rng(seed)
+    return lambda core: (rng.below(3) - 1, rng.below(3) - 1)
+
+
+def snake_script(seed):
+    """Both snakes head for the food, never reversing, with the odd random turn"""
+    rng = Rng(seed)
+
+    def choose(core):
+        turns = []
+        for index, snake in enumerate(core.snakes):
+            current = core.directions[index]
+            food = core.food or snake[0]
+            dx, dy = food[0] - snake[0][0], food[1] - snake[0][1]
+            wanted = ("right" if dx > 0 else "left") if dx and (not dy or rng.below(2)) else \
+                ("down" if dy > 0 else "up")
+            if rng.below(10) == 0:
+                wanted = list(DIRECTIONS)[rng.below(4)]
+            turns.append(current if wanted == OPPOSITE[current] else wanted)
+        return turns
+    return choose
+
+
+def run(core, script, ticks):
+    """Step ``core`` with ``script(core)`` inputs and return the per-tick hashes"""
+    hashes = []
+    for _ in range(ticks):
+        inputs = script(core)
+        if isinstance(core, PongCore):
+            core.step(*inputs)
+        else:
+            core.step(inputs)
+        hashes.append(core.state_hash())
+    return hashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step the game cores headless and check determinism")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    for name, make, script in (("pong", PongCore, pong_script), ("snake", SnakeCore, snake_script)):
+        runs = []
+        for _ in range(2):
+            core = make(seed=args.seed)
+            start = time.perf_counter()
+            runs.append(run(core, script(args.seed + 1), args.ticks))
+            elapsed = time.perf_counter() - start
+        mismatch = next((i for i, (a, b) in enumerate(zip(*runs)) if a != b), None)
+        status = "deterministic" if mismatch is None else f"DESYNC at tick {mismatch}"
+        print(f"{name}: {args.ticks / elapsed:,.0f} ticks/s, final hash {runs[0][-1]:08x}, {status}")
+
+
+if __name__ == "__main__":
+    main()
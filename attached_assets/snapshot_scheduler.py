@@ -0,0 +1,109 @@
+"""Per-field scheduling of replicated game state.
+
+Fast-changing state (ball, snakes, paddles) goes out every tick. Slow
+fields such as scores are registered with ``add_field`` and are only sent
+when their value changes or when they haven't been sent for ``max_age``
+ticks. The refresh covers messages the receiver had to drop.
+
+Each packet has a soft size budget, estimated as the size of the fields
+encoded as JSON whatever protocol version actually carries them (the v2
+binary frames are smaller, so the estimate errs on the safe side).
+Changed slow fields are added in priority order while they fit; the rest wait for a later tick. A field
+past its staleness budget goes out regardless, so nothing is starved.
+
+Receivers must treat every slow field as optional. A sender that is about
+to stop sending (e.g. on game over) passes ``flush`` so nothing is left
+waiting for a tick that never comes.
+"""
+import json
+
+
+class SnapshotField:
+    __slots__ = ("name", "priority", "max_age", "last_encoded", "last_sent")
+
+    def __init__(self, name, priority, max_age):
+        self.name = name
+        self.priority = priority
+        self.max_age = max_age
+        self.last_encoded = None
+        self.last_sent = None
+
+
+class SnapshotScheduler:
+    def __init__(self, max_bytes=512):
+        self.max_bytes = max_bytes
+        self.fields = {}
+        self.by_priority = []
+
+    def add_field(self, name, priority=0, max_age=30):
+        """Register a slow field; higher priority fields win when space is short"""
+        self.fields[name] = SnapshotField(name, priority, max_age)
+        self.by_priority = sorted(self.fields.values(), key=lambda f: -f.priority)
+
+    def reset(self):
+        """Resend every slow field on the next packet (e.g. after a reconnect)"""
+        for field in self.fields.values():
+            field.last_encoded = None
+            field.last_sent = None
+
+    def build(self, tick, values, flush=False):
+        """The fields to send this tick, or None if there is nothing to send.
+
+        ``values`` maps field names to their current values. Fields that
+        weren't registered are sent every time unless their value is None.
+        With ``flush`` every changed field goes out whatever the budget.
+        ``max_bytes`` is compared against the JSON size of the packet.
+        """
+        fields = self.fields
+        packet = {}
+        size = 2
+        for name, value in values.items():
+            if name in fields or value is None:
+                continue
+            packet[name] = value
+            size += len(name) + len(json.dumps(value)) + 4
+
+        for field in self.by_priority:
+            if field.name not in values:
+                continue
+            # Compare encoded values: the game may mutate the same list in place
+            encoded = json.dumps(values[field.name])
+            overdue = field.last_sent is None or tick - field.last_sent >= field.max_age
+            if encoded == field.last_encoded and not overdue:
+                continue
+            part_size = len(field.name) + len(encoded) + 4
+            if not overdue and not flush and size + part_size > self.max_bytes:
+                # Changed but not urgent; try again next tick
+                continue
+            packet[field.name] = values[field.name]
+            size += part_size
+            field.last_encoded = encoded
+            field.last_sent = tick
+
+        return packet or None
+
+
+# Schedules shared by the games and hub_bots, so bot traffic matches the hub's
+
+def pong_snapshots():
+    """Paddles and ball go out every tick; scores when they change, or once a second"""
+    snapshots = SnapshotScheduler()
+    snapshots.add_field("player_score", priority=1, max_age=60)
+    snapshots.add_field("opponent_score", priority=1, max_age=60)
+    return snapshots
+
+
+def snake_snapshots():
+    """Snakes go out every move; the rest when it changes, or after a few moves.
+
+    The budget is larger than Pong's since the snakes alone take a few hundred
+    JSON bytes once they have grown.
+    """
+    snapshots = SnapshotScheduler(max_bytes=1024)
+    snapshots.add_field("game_over", priority=3, max_age=5)
+    snapshots.add_field("food", priority=2, max_age=5)
+    snapshots.add_field("player_alive", priority=1, max_age=10)
+    snapshots.add_field("opponent_alive", priority=1, max_age=10)
+    snapshots.add_field("player_score", max_age=20)
+    snapshots.add_field("opponent_score", max_age=20)
+    return snapshots
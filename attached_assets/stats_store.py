@@ -0,0 +1,203 @@
+"""Persistent match results and leaderboards in a local SQLite database.
+
+The game loop never touches the database: ``record`` puts the result on a
+queue and a background thread writes whatever has piled up in a single
+transaction. The database runs in WAL mode, so a crash loses at most the
+batch in flight and readers never block the writer.
+
+Per-player totals are kept in summary tables updated in the same
+transaction as the match rows, so the menu's "Games / Wins" line is one
+primary-key lookup however many matches have been played, and leaderboards
+walk an index instead of aggregating the match history.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+WIN = "win"
+LOSS = "loss"
+DRAW = "draw"
+
+
+
+def default_path():
+    """hub_stats.db in the per-user data directory, so runs don't litter the working directory"""
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    directory = os.path.join(base, "gaming_hub")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "hub_stats.db")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    player TEXT NOT NULL,
+    opponent TEXT,
+    game TEXT NOT NULL,
+    result TEXT,
+    player_score INTEGER,
+    opponent_score INTEGER,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS matches_by_player ON matches (player, played_at);
+
+CREATE TABLE IF NOT EXISTS player_totals (
+    player TEXT PRIMARY KEY,
+    played INTEGER NOT NULL DEFAULT 0,
+    won INTEGER NOT NULL DEFAULT 0,
+    lost INTEGER NOT NULL DEFAULT 0,
+    drawn INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS game_totals (
+    game TEXT NOT NULL,
+    player TEXT NOT NULL,
+    played INTEGER NOT NULL DEFAULT 0,
+    won INTEGER NOT NULL DEFAULT 0,
+    lost INTEGER NOT NULL DEFAULT 0,
+    drawn INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (game, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS game_leaders ON game_totals (game, won DESC, played);
+CREATE INDEX IF NOT EXISTS player_leaders ON player_totals (won DESC, played);
+"""
+
+UPSERT_PLAYER = """
+INSERT INTO player_totals (player, played, won, lost, drawn) VALUES (?, 1, ?, ?, ?)
+ON CONFLICT (player) DO UPDATE SET
+    played = played + 1, won = won + excluded.won,
+    lost = lost + excluded.lost, drawn = drawn + excluded.drawn
+"""
+
+UPSERT_GAME = """
+INSERT INTO game_totals (game, player, played, won, lost, drawn) VALUES (?, ?, 1, ?, ?, ?)
+ON CONFLICT (game, player) DO UPDATE SET
+    played = played + 1, won = won + excluded.won,
+    lost = lost + excluded.lost, drawn = drawn + excluded.drawn
+"""
+
+# Sentinel asking the writer to flush and stop
+_STOP = object()
+
+
+def connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only risks the last commits on power loss, never corruption
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class StatsStore:
+    def __init__(self, path=None, batch_size=256, flush_interval=0.5):
+        self.path = path = path or default_path()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+
+        # Totals shown in the menu, read once per player and then kept current in memory
+        self.totals_cache = {}
+        self.read_lock = threading.Lock()
+        self.reader = connect(path)
+
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def record(self, player, game, result, opponent=None, player_score=None, opponent_score=None,
+               duration=None):
+        """Queue one match result; returns immediately"""
+        row = (time.time(), player, opponent, game, result, player_score, opponent_score, duration)
+        totals = self.totals(player)
+        totals["played"] += 1
+        if result == WIN:
+            totals["won"] += 1
+        elif result == LOSS:
+            totals["lost"] += 1
+        elif result == DRAW:
+            totals["drawn"] += 1
+        self.pending.put(row)
+
+    def totals(self, player):
+        """Played/won/lost/drawn counts for the menu"""
+        totals = self.totals_cache.get(player)
+        if totals is None:
+            with self.read_lock:
+                row = self.reader.execute(
+                    "SELECT played, won, lost, drawn FROM player_totals WHERE player = ?",
+                    (player,)).fetchone()
+            totals = dict(zip(("played", "won", "lost", "drawn"), row or (0, 0, 0, 0)))
+            self.totals_cache[player] = totals
+        return totals
+
+    def leaderboard(self, game=None, limit=10):
+        """Top players by wins, overall or for one game"""
+        with self.read_lock:
+            if game is None:
+                return self.reader.execute(
+                    "SELECT player, played, won, lost, drawn FROM player_totals "
+                    "ORDER BY won DESC, played LIMIT ?", (limit,)).fetchall()
+            return self.reader.execute(
+                "SELECT player, played, won, lost, drawn FROM game_totals WHERE game = ? "
+                "ORDER BY won DESC, played LIMIT ?", (game, limit)).fetchall()
+
+    def history(self, player, limit=20):
+        """A player's most recent matches, newest first"""
+        with self.read_lock:
+            return self.reader.execute(
+                "SELECT played_at, opponent, game, result, player_score, opponent_score, duration "
+                "FROM matches WHERE player = ? ORDER BY played_at DESC LIMIT ?",
+                (player, limit)).fetchall()
+
+    def write_loop(self):
+        connection = connect(self.path)
+        running = True
+        while running:
+            # Block for the first result, then take everything else already waiting
+            batch = []
+            try:
+                item = self.pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while item is not _STOP and len(batch) < self.batch_size:
+                batch.append(item)
+                try:
+                    item = self.pending.get_nowait()
+                except queue.Empty:
+                    item = None
+                    break
+            if item is _STOP:
+                running = False
+            elif item is not None:
+                # Batch full; the row that ended the loop still belongs to it
+                batch.append(item)
+
+            if batch:
+                self.write_batch(connection, batch)
+        connection.close()
+
+    def write_batch(self, connection, batch):
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO matches (played_at, player, opponent, game, result, "
+                    "player_score, opponent_score, duration) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                for played_at, player, opponent, game, result, *_ in batch:
+                    counts = (result == WIN, result == LOSS, result == DRAW)
+                    connection.execute(UPSERT_PLAYER, (player, *counts))
+                    connection.execute(UPSERT_GAME, (game, player, *counts))
+        except sqlite3.Error as e:
+            print(f"Could not save match results: {e}")
+
+    def close(self):
+        """Write everything still queued and stop the writer"""
+        self.pending.put(_STOP)
+        self.writer.join()
+        with self.read_lock:
+            self.reader.close()
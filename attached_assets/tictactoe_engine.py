@@ -0,0 +1,354 @@
+import base64
+import time
+from functools import lru_cache
+
+EMPTY = 0
+X = 1
+O = 2
+
+# Scores used by the solver; anything above WIN_THRESHOLD is a forced win
+WIN_SCORE = 1_000_000
+WIN_THRESHOLD = WIN_SCORE - 10_000
+
+
+@lru_cache(maxsize=None)
+def build_lines(size, win_length):
+    """Precompute every K-in-a-row mask for an N×N board.
+
+    Returns (all_masks, masks_through_cell) where masks_through_cell[i]
+    holds only the lines that pass through cell i, so a win check after a
+    move touches O(lines through the move) masks instead of the whole board.
+    """
+    masks = []
+    through = [[] for _ in range(size * size)]
+    directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in directions:
+                end_row = row + d_row * (win_length - 1)
+                end_col = col + d_col * (win_length - 1)
+                if not (0 <= end_row < size and 0 <= end_col < size):
+                    continue
+
+                mask = 0
+                cells = []
+                for step in range(win_length):
+                    index = (row + d_row * step) * size + col + d_col * step
+                    mask |= 1 << index
+                    cells.append(index)
+
+                masks.append(mask)
+                for index in cells:
+                    through[index].append(mask)
+
+    return tuple(masks), tuple(tuple(lines) for lines in through)
+
+
+@lru_cache(maxsize=None)
+def build_neighbours(size):
+    """Mask of the (up to 8) cells surrounding each cell"""
+    neighbours = []
+    for row in range(size):
+        for col in range(size):
+            mask = 0
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    r, c = row + d_row, col + d_col
+                    if (d_row or d_col) and 0 <= r < size and 0 <= c < size:
+                        mask |= 1 << (r * size + c)
+            neighbours.append(mask)
+    return tuple(neighbours)
+
+
+class BitBoard:
+    """N×N Tic-Tac-Toe board stored as one integer bitmask per piece"""
+    def __init__(self, size=3, win_length=None):
+        self.size = size
+        self.win_length = win_length or size
+        if not 1 <= self.win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}")
+
+        self.cell_count = size * size
+        self.full_mask = (1 << self.cell_count) - 1
+        self.lines, self.lines_through = build_lines(size, self.win_length)
+
+        # bits[1] holds X, bits[2] holds O; index 0 is unused
+        self.bits = [0, 0, 0]
+        self.history = []
+        self.winner = EMPTY
+        self.game_over = False
+
+    @property
+    def occupied(self):
+        return self.bits[X] | self.bits[O]
+
+    def index(self, row, col):
+        return row * self.size + col
+
+    def position(self, index):
+        return divmod(index, self.size)
+
+    def get(self, row, col):
+        bit = 1 << self.index(row, col)
+        if self.bits[X] & bit:
+            return X
+        if self.bits[O] & bit:
+            return O
+        return EMPTY
+
+    def is_empty(self, index):
+        return 0 <= index < self.cell_count and not self.occupied >> index & 1
+
+    def is_full(self):
+        return self.occupied == self.full_mask
+
+    def legal_moves(self):
+        free = ~self.occupied & self.full_mask
+        moves = []
+        while free:
+            low = free & -free
+            moves.append(low.bit_length() - 1)
+            free ^= low
+        return moves
+
+    def is_winning_move(self, index, piece):
+        """Would placing piece at index complete a line?"""
+        bits = self.bits[piece] | 1 << index
+        for mask in self.lines_through[index]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def play(self, index, piece):
+        """Place a piece and update winner/game_over incrementally"""
+        if self.game_over or not self.is_empty(index):
+            raise ValueError(f"Illegal move {index}")
+
+        won = self.is_winning_move(index, piece)
+        self.bits[piece] |= 1 << index
+        self.history.append(index)
+
+        if won:
+            self.winner = piece
+            self.game_over = True
+        elif self.is_full():
+            self.game_over = True
+        return self.winner
+
+    def undo(self):
+        index = self.history.pop()
+        bit = 1 << index
+        self.bits[X] &= ~bit
+        self.bits[O] &= ~bit
+        self.winner = EMPTY
+        self.game_over = False
+        return index
+
+    def piece_to_move(self):
+        """X always starts, so the side to move follows from the move count"""
+        return X if len(self.history) % 2 == 0 else O
+
+    def encode_history(self):
+        """Compact, JSON-safe encoding of the move list (1 byte per move up to 16×16)"""
+        width = 1 if self.cell_count <= 256 else 2
+        raw = b"".join(index.to_bytes(width, "big") for index in self.history)
+        return base64.b64encode(raw).decode("ascii")
+
+    @classmethod
+    def from_history(cls, encoded, size=3, win_length=None):
+        board = cls(size, win_length)
+        width = 1 if board.cell_count <= 256 else 2
+        raw = base64.b64decode(encoded)
+        for offset in range(0, len(raw), width):
+            index = int.from_bytes(raw[offset:offset + width], "big")
+            board.play(index, board.piece_to_move())
+        return board
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class TicTacToeAI:
+    """Negamax opponent with alpha-beta pruning and a transposition table.
+
+    Small boards are solved outright; larger boards use iterative deepening
+    under a time budget so the AI always answers within a frame or two.
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    def __init__(self, piece, time_budget=0.05, max_depth=None):
+        self.piece = piece
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table = {}
+        self.nodes = 0
+        self.deadline = None
+
+    def choose_move(self, board):
+        moves = board.legal_moves()
+        if not moves:
+            return None
+
+        self.lines = board.lines
+        self.lines_through = board.lines_through
+        self.neighbours = build_neighbours(board.size)
+        self.full_mask = board.full_mask
+        self.centre_order = self._centre_order(board.size)
+        self.use_neighbourhood = board.size > 4
+
+        mine = board.bits[self.piece]
+        theirs = board.bits[X if self.piece == O else O]
+
+        # Take an immediate win, otherwise block the opponent's
+        for index in moves:
+            if board.is_winning_move(index, self.piece):
+                return index
+        for index in moves:
+            if board.is_winning_move(index, X if self.piece == O else O):
+                return index
+
+        # Transpositions from earlier, shallower searches stay valid
+        if len(self.table) > 500_000:
+            self.table.clear()
+
+        best = self._candidates(mine | theirs)[0]
+        limit = len(moves) if self.max_depth is None else min(self.max_depth, len(moves))
+        self.deadline = time.perf_counter() + self.time_budget
+        self.nodes = 0
+
+        for depth in range(1, limit + 1):
+            try:
+                score, move = self._search_root(mine, theirs, depth)
+            except SearchTimeout:
+                break
+            if move is not None:
+                best = move
+            if abs(score) >= WIN_THRESHOLD:
+                break
+        return best
+
+    def _centre_order(self, size):
+        centre = (size - 1) / 2
+        return sorted(range(size * size),
+                      key=lambda i: abs(i // size - centre) + abs(i % size - centre))
+
+    def _candidates(self, occupied):
+        free = ~occupied & self.full_mask
+        if self.use_neighbourhood and occupied:
+            near = 0
+            bits = occupied
+            while bits:
+                low = bits & -bits
+                near |= self.neighbours[low.bit_length() - 1]
+                bits ^= low
+            if free & near:
+                free &= near
+        return [i for i in self.centre_order if free >> i & 1]
+
+    def _search_root(self, mine, theirs, depth):
+        alpha, beta = -WIN_SCORE, WIN_SCORE
+        best_move = None
+        entry = self.table.get((mine, theirs))
+        moves = self._candidates(mine | theirs)
+        if entry and entry[3] in moves:
+            moves.remove(entry[3])
+            moves.insert(0, entry[3])
+
+        for index in moves:
+            score = -self._negamax(theirs, mine | 1 << index, depth - 1, -beta, -alpha)
+            score = self._decay(score)
+            if score > alpha or best_move is None:
+                alpha = score
+                best_move = index
+        self.table[(mine, theirs)] = (depth, alpha, self.EXACT, best_move)
+        return alpha, best_move
+
+    def _decay(self, score):
+        # Keep scores node-relative so faster wins (and slower losses) rank higher
+        if score > WIN_THRESHOLD:
+            return score - 1
+        if score < -WIN_THRESHOLD:
+            return score + 1
+        return score
+
+    def _negamax(self, mine, theirs, depth, alpha, beta):
+        """Score for the side owning `mine`, which is to move"""
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        occupied = mine | theirs
+        if occupied == self.full_mask:
+            return 0
+        if depth == 0:
+            return self._evaluate(mine, theirs)
+
+        key = (mine, theirs)
+        entry = self.table.get(key)
+        tt_move = None
+        if entry:
+            entry_depth, value, flag, tt_move = entry
+            if entry_depth >= depth:
+                if flag == self.EXACT:
+                    return value
+                if flag == self.LOWER:
+                    alpha = max(alpha, value)
+                elif flag == self.UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        moves = self._candidates(occupied)
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        original_alpha = alpha
+        best = -WIN_SCORE
+        best_move = None
+        for index in moves:
+            bit = 1 << index
+            placed = mine | bit
+            won = False
+            for mask in self.lines_through[index]:
+                if placed & mask == mask:
+                    won = True
+                    break
+
+            if won:
+                score = WIN_SCORE - 1
+            else:
+                score = self._decay(-self._negamax(theirs, placed, depth - 1, -beta, -alpha))
+
+            if score > best:
+                best = score
+                best_move = index
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = self.UPPER
+        elif best >= beta:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+        self.table[key] = (depth, best, flag, best_move)
+        return best
+
+    def _evaluate(self, mine, theirs):
+        """Open-line heuristic: lines holding only one side's pieces score 4^count"""
+        score = 0
+        for mask in self.lines:
+            own = mine & mask
+            other = theirs & mask
+            if own and not other:
+                score += 4 ** own.bit_count()
+            elif other and not own:
+                score -= 4 ** other.bit_count()
+        return score
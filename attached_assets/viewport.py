@@ -0,0 +1,113 @@
+"""Fixed logical-resolution rendering scaled to whatever the window is.
+
+The hub and every game draw onto one 800x600 logical surface, so the
+number of Python draw calls never depends on the window size.
+
+Where SDL has a renderer, that surface is SDL's own backbuffer
+(``pygame.SCALED``) and the GPU stretches it to the window, so a bigger
+window costs the CPU nothing. Otherwise ``present`` scales the surface into
+the window in a single C call, into a destination that is only reallocated
+when the window is resized, and letterboxes to keep the aspect ratio.
+``smooth=False`` picks the cheaper nearest-neighbour filter for slow
+machines. Mouse positions are mapped back with ``to_logical``.
+"""
+import pygame
+
+MOUSE_EVENTS = {pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION}
+
+_current = None
+
+
+class Viewport:
+    def __init__(self, logical_size=(800, 600), window_size=None, smooth=True):
+        self.logical_size = logical_size
+        window_size = window_size or logical_size
+        self.scaler = pygame.transform.smoothscale if smooth else pygame.transform.scale
+
+        self.hardware = False
+        if window_size != logical_size:
+            try:
+                # Games draw straight into SDL's logical backbuffer; the GPU does the scaling
+                self.window = pygame.display.set_mode(logical_size, pygame.SCALED | pygame.RESIZABLE)
+                self.hardware = True
+                resize_window(window_size)
+            except (pygame.error, ImportError, AttributeError):
+                # No renderer (or no window API to size it): scale in software
+                pass
+        if not self.hardware:
+            self.window = pygame.display.set_mode(window_size, pygame.RESIZABLE)
+
+        self.surface = self.window if self.hardware else pygame.Surface(logical_size).convert()
+        self.window_size = None
+        self.fit()
+
+    def fit(self):
+        """Work out where the logical frame goes in the window and cache the scaling target"""
+        if self.hardware:
+            self.window_size = self.logical_size
+            self.target = pygame.Rect((0, 0), self.logical_size)
+            self.scaled = None
+            return
+        self.window = pygame.display.get_surface()
+        self.window_size = window_width, window_height = self.window.get_size()
+        logical_width, logical_height = self.logical_size
+        scale = min(window_width / logical_width, window_height / logical_height)
+        size = (max(1, round(logical_width * scale)), max(1, round(logical_height * scale)))
+        self.target = pygame.Rect(((window_width - size[0]) // 2, (window_height - size[1]) // 2), size)
+
+        # Scale straight into the window; the subsurface is only rebuilt on resize
+        self.window.fill((0, 0, 0))
+        self.scaled = None if size == self.logical_size else self.window.subsurface(self.target)
+
+    def present(self):
+        if self.hardware:
+            pygame.display.flip()
+            return
+        if pygame.display.get_surface().get_size() != self.window_size:
+            self.fit()
+        if self.scaled is None:
+            self.window.blit(self.surface, self.target)
+        else:
+            self.scaler(self.surface, self.target.size, self.scaled)
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        """Window coordinates to logical-surface coordinates (SDL maps them itself when scaling)"""
+        x, y = pos
+        return (int((x - self.target.x) * self.logical_size[0] / self.target.width),
+                int((y - self.target.y) * self.logical_size[1] / self.target.height))
+
+    def map_event(self, event):
+        """The event in logical coordinates, or None for a mouse event in the letterbox bars"""
+        if event.type in MOUSE_EVENTS:
+            if not self.target.collidepoint(event.pos):
+                return None
+            event.pos = self.to_logical(event.pos)
+        return event
+
+
+def resize_window(size):
+    """Set the real window size in SCALED mode, where set_mode only takes the logical size"""
+    from pygame._sdl2.video import Window
+    Window.from_display_module().size = size
+
+
+def open_viewport(logical_size=(800, 600), window_size=None, smooth=True):
+    """Create the window and make it the one ``present`` and ``map_event`` use"""
+    global _current
+    _current = Viewport(logical_size, window_size, smooth)
+    return _current
+
+
+def present():
+    """Show the finished frame; plain flip when no viewport was opened"""
+    if _current is None:
+        pygame.display.flip()
+    else:
+        _current.present()
+
+
+def map_event(event):
+    if _current is None:
+        return event
+    return _current.map_event(event)
@@ -0,0 +1,405 @@
+"""Message schemas, codecs and framing for hub connections.
+
+Every message the hub and its games exchange is declared once below with a
+numeric id and typed fields. Codecs are built when a type is declared.
+Fixed-size fields share one precompiled ``struct.Struct``. Variable-size
+fields follow it, each behind a length prefix.
+
+Two protocol versions are spoken, negotiated in the username handshake:
+
+1. The original format: one bare JSON object per ``send``. Peers that
+   predate the handshake field only speak this.
+2. Frames of ``<type id: u8><body length: u32><body>``. They are
+   length-prefixed, so coalesced or split reads are never lost.
+
+Either way, games call ``Channel.send`` with a plain dict and get
+``(type name, fields)`` pairs back from ``Channel.receive``. Dispatch is
+then a table lookup on the type name. Legacy JSON is classified by each
+type's key field (its first field), so both versions reach the same
+handlers. Anything without a schema travels as a JSON frame (type 0).
+"""
+import base64
+import json
+import struct
+
+PROTOCOL_VERSIONS = (1, 2)
+
+FRAME_HEADER = struct.Struct("<BI")
+LENGTH = struct.Struct("<I")
+JSON_FRAME = 0
+
+FIXED_KINDS = {"u8": "B", "u16": "H", "i16": "h", "u32": "I", "i32": "i", "f64": "d", "bool": "?"}
+
+
+# Variable-size kinds: (encode value -> bytes, decode memoryview -> value)
+def _encode_cells(cells):
+    return bytes(value for cell in cells for value in (cell["x"], cell["y"]))
+
+
+def _decode_cells(view):
+    return [{"x": view[i], "y": view[i + 1]} for i in range(0, len(view), 2)]
+
+
+def _encode_cell(cell):
+    return b"" if cell is None else struct.pack("<hh", cell["x"], cell["y"])
+
+
+def _decode_cell(view):
+    if not len(view):
+        return None
+    x, y = struct.unpack_from("<hh", view)
+    return {"x": x, "y": y}
+
+
+VARIABLE_KINDS = {
+    "str": (lambda value: value.encode(), lambda view: str(view, "utf-8")),
+    # Decoded bytes stay a view into the received buffer; no copy
+    "bytes": (bytes, lambda view: view),
+    # base64 text on the dict side (for JSON), raw bytes on the wire
+    "base64": (base64.b64decode, lambda view: view),
+    "json": (lambda value: json.dumps(value, separators=(",", ":")).encode(),
+             lambda view: json.loads(str(view, "utf-8"))),
+    # Snake bodies: a list of {"x", "y"} cells as byte pairs
+    "cells": (_encode_cells, _decode_cells),
+    "cell": (_encode_cell, _decode_cell),
+}
+
+
+class MessageType:
+    def __init__(self, type_id, name, fields):
+        self.type_id = type_id
+        self.name = name
+        self.field_names = [field for field, _ in fields]
+        self.key = self.field_names[0]
+
+        self.fixed = [field for field, kind in fields if kind in FIXED_KINDS]
+        self.variable = [(field, VARIABLE_KINDS[kind]) for field, kind in fields if kind not in FIXED_KINDS]
+        self.struct = struct.Struct("<" + "".join(FIXED_KINDS[kind] for _, kind in fields
+                                                  if kind in FIXED_KINDS))
+
+    def encode(self, values):
+        parts = [self.struct.pack(*[values[field] for field in self.fixed])]
+        for field, (encode, _) in self.variable:
+            data = encode(values[field])
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    def decode(self, view):
+        values = dict(zip(self.fixed, self.struct.unpack_from(view)))
+        offset = self.struct.size
+        for field, (_, decode) in self.variable:
+            (length,) = LENGTH.unpack_from(view, offset)
+            offset += LENGTH.size
+            values[field] = decode(view[offset:offset + length])
+            offset += length
+        return values
+
+
+MESSAGE_TYPES = {}
+TYPES_BY_NAME = {}
+TYPES_BY_KEY = {}
+
+
+def message_type(type_id, name, *fields):
+    """Declare a message; its first field is the one that identifies legacy JSON"""
+    entry = MessageType(type_id, name, fields)
+    if type_id == JSON_FRAME or type_id in MESSAGE_TYPES or entry.key in TYPES_BY_KEY:
+        raise ValueError(f"message type {name} clashes with an existing one")
+    MESSAGE_TYPES[type_id] = TYPES_BY_NAME[name] = TYPES_BY_KEY[entry.key] = entry
+    return entry
+
+
+# Hub
+message_type(1, "hello", ("username", "str"), ("protocol", "json"))
+message_type(2, "game_selection", ("game_selection", "u8"))
+# Send-time stamp hub_bots adds to every message to measure latency
+message_type(4, "sent_at", ("bot_sent_at", "f64"))
+# Shared by every real-time game
+message_type(3, "inputs", ("inputs", "json"))
+# Pong
+message_type(10, "paddle", ("paddle_y", "i16"))
+message_type(11, "ball", ("ball_x", "i16"), ("ball_y", "i16"))
+message_type(12, "player_score", ("player_score", "u16"))
+message_type(13, "opponent_score", ("opponent_score", "u16"))
+message_type(14, "balls", ("balls", "base64"))
+# Tic-Tac-Toe
+message_type(20, "move", ("move", "json"), ("piece", "json"), ("history", "str"))
+# Snake
+message_type(30, "snakes", ("player_snake", "cells"), ("opponent_snake", "cells"))
+message_type(31, "food", ("food", "cell"))
+message_type(32, "player_alive", ("player_alive", "bool"))
+message_type(33, "opponent_alive", ("opponent_alive", "bool"))
+message_type(34, "game_over", ("game_over", "bool"))
+message_type(35, "direction", ("direction", "str"))
+# Snake Arena
+message_type(40, "arena", ("arena", "json"))
+
+# Metadata riding along with real messages; receivers skip these without counting a drop
+METADATA_MESSAGES = {"sent_at"}
+
+
+def classify(message):
+    """Split a legacy dict into (type name, fields) pairs by key field.
+
+    Keys no schema claims are returned separately.
+    """
+    typed = []
+    claimed = set()
+    for key in message:
+        entry = TYPES_BY_KEY.get(key)
+        if entry is None:
+            continue
+        fields = {field: message[field] for field in entry.field_names if field in message}
+        claimed.update(fields)
+        typed.append((entry, fields))
+    leftover = {key: value for key, value in message.items() if key not in claimed}
+    return typed, leftover
+
+
+def encode_frames(message):
+    """Version 2 bytes for a dict: one typed frame per schema, JSON for the rest"""
+    return encode_classified(*classify(message))
+
+
+def encode_classified(typed, leftover):
+    frames = []
+    for entry, fields in typed:
+        try:
+            if len(fields) != len(entry.field_names):
+                raise ValueError("incomplete")
+            body = entry.encode(fields)
+            type_id = entry.type_id
+        except (struct.error, ValueError, TypeError, KeyError, OverflowError):
+            # Values this schema can't hold (e.g. an off-grid cell) still get through as JSON
+            body = json.dumps(fields, separators=(",", ":")).encode()
+            type_id = JSON_FRAME
+        frames.append(FRAME_HEADER.pack(type_id, len(body)))
+        frames.append(body)
+    if leftover:
+        body = json.dumps(leftover, separators=(",", ":")).encode()
+        frames.append(FRAME_HEADER.pack(JSON_FRAME, len(body)))
+        frames.append(body)
+    return b"".join(frames)
+
+
+def decode_json(message, messages):
+    if not isinstance(message, dict):
+        raise ValueError("message is not a JSON object")
+    typed, leftover = classify(message)
+    messages.extend((entry.name, fields) for entry, fields in typed)
+    if leftover:
+        messages.append((None, "unknown"))
+
+
+def split_json(buffer, limit=None):
+    """Complete JSON objects at the start of a byte buffer, and where they end.
+
+    Version 1 has no framing, so track brace depth (outside strings) to find
+    where each object stops.
+    """
+    objects = []
+    depth = 0
+    in_string = False
+    escaped = False
+    start = 0
+    for i, char in enumerate(buffer):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == 0x5C:  # backslash
+                escaped = True
+            elif char == 0x22:  # quote
+                in_string = False
+        elif char == 0x22:
+            in_string = True
+        elif char == 0x7B:  # {
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == 0x7D and depth > 0:  # }
+            depth -= 1
+            if depth == 0:
+                objects.append(buffer[start:i + 1])
+                if limit is not None and len(objects) >= limit:
+                    return objects, i + 1
+    # Keep an unfinished object for the next read; anything between objects is noise
+    return objects, start if depth else len(buffer)
+
+
+def negotiate(theirs, ours=PROTOCOL_VERSIONS):
+    """Highest version both sides speak; peers that don't say speak version 1"""
+    if not isinstance(theirs, list):
+        return 1
+    common = set(ours).intersection(theirs)
+    return max(common) if common else 1
+
+
+class Channel:
+    """A connected socket plus its negotiated protocol version and receive buffer"""
+    def __init__(self, sock, version=1):
+        self.sock = sock
+        self.version = version
+        self.buffer = b""
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # Per-peer message counters when the socket is a metrics.MeteredSocket
+        self.messages_sent = getattr(sock, "messages_sent", None)
+        self.messages_received = getattr(sock, "messages_received", None)
+
+    def send(self, message):
+        typed, leftover = classify(message)
+        if self.version >= 2:
+            data = encode_classified(typed, leftover)
+        else:
+            data = json.dumps(message).encode()
+        self.sock.sendall(data)
+        self.bytes_sent += len(data)
+        if self.messages_sent is not None:
+            # Counted as the receiver will see them, whichever version carries them
+            self.messages_sent.inc(len(typed) + bool(leftover))
+
+    def receive(self, size=65536, limit=None):
+        """Read once and return the complete (type name, fields) messages.
+
+        Blocks according to the socket's timeout and raises what ``recv``
+        raises. ``limit`` stops after that many messages, leaving the rest
+        buffered (the handshake uses it before switching versions).
+        """
+        messages = self.parse(limit)
+        if messages:
+            return messages
+        data = self.sock.recv(size)
+        if not data:
+            raise ConnectionError("peer closed the connection")
+        self.bytes_received += len(data)
+        # Zero-copy in the common case where nothing was left over
+        self.buffer = self.buffer + data if self.buffer else data
+        return self.parse(limit)
+
+    def parse(self, limit=None):
+        """Complete messages already buffered.
+
+        A frame or object that can't be decoded comes back as
+        ``(None, "decode")`` and one of a type this side doesn't know as
+        ``(None, "unknown")``, so the caller can count it and carry on.
+        """
+        messages = []
+        buffer = self.buffer
+        if self.version >= 2:
+            view = memoryview(buffer)
+            offset = 0
+            while len(buffer) - offset >= FRAME_HEADER.size and (limit is None or len(messages) < limit):
+                type_id, length = FRAME_HEADER.unpack_from(view, offset)
+                start = offset + FRAME_HEADER.size
+                if len(buffer) - start < length:
+                    break
+                # Step past the frame first, so a bad one can never be read twice
+                body = view[start:start + length]
+                offset = start + length
+                entry = MESSAGE_TYPES.get(type_id)
+                try:
+                    if type_id == JSON_FRAME:
+                        decode_json(json.loads(str(body, "utf-8")), messages)
+                    elif entry is None:
+                        # A newer peer's message; the frame length says how far to skip
+                        messages.append((None, "unknown"))
+                    else:
+                        messages.append((entry.name, entry.decode(body)))
+                except Exception:
+                    # Whatever a malformed body trips over (short struct, odd cell list, bad UTF-8)
+                    messages.append((None, "decode"))
+            self.buffer = buffer[offset:] if offset else buffer
+        else:
+            objects, end = split_json(buffer, limit)
+            self.buffer = buffer[end:]
+            for text in objects:
+                try:
+                    decode_json(json.loads(text), messages)
+                except Exception:
+                    messages.append((None, "decode"))
+        if messages and self.messages_received is not None:
+            self.messages_received.inc(len(messages))
+        return messages
+
+    def settimeout(self, timeout):
+        self.sock.settimeout(timeout)
+
+    def close(self):
+        self.sock.close()
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+# Round-trip values for every message type, used by the self-check below
+SAMPLES = {
+    "hello": {"username": "player", "protocol": [1, 2]},
+    "game_selection": {"game_selection": 4},
+    "sent_at": {"bot_sent_at": 1234.5},
+    "inputs": {"inputs": [{"s": 1, "t": 20, "a": "turn", "v": "up"}]},
+    "paddle": {"paddle_y": 250},
+    "ball": {"ball_x": 392, "ball_y": -3},
+    "player_score": {"player_score": 7},
+    "opponent_score": {"opponent_score": 11},
+    "balls": {"balls": base64.b64encode(bytes(range(8))).decode("ascii")},
+    "move": {"move": [1, 2], "piece": 1, "history": "48"},
+    "snakes": {"player_snake": [{"x": 5, "y": 5}, {"x": 4, "y": 5}], "opponent_snake": []},
+    "food": {"food": {"x": 39, "y": 29}},
+    "player_alive": {"player_alive": True},
+    "opponent_alive": {"opponent_alive": False},
+    "game_over": {"game_over": True},
+    "direction": {"direction": "left"},
+    "arena": {"arena": {"tick": 3, "cells": [[1, 2, 3]]}},
+}
+
+
+class LoopbackSocket:
+    """Just enough of a socket for a Channel to read back what was sent"""
+    def __init__(self):
+        self.data = b""
+
+    def sendall(self, data):
+        self.data += data
+
+    def recv(self, size):
+        data, self.data = self.data[:size], self.data[size:]
+        return data
+
+
+def plain(value):
+    # Binary fields decode to views; compare them as the base64 text they were sent as
+    if isinstance(value, memoryview):
+        return base64.b64encode(value).decode("ascii")
+    return value
+
+
+def main():
+    missing = set(TYPES_BY_NAME) - set(SAMPLES)
+    assert not missing, f"no sample for {sorted(missing)}"
+
+    for version in PROTOCOL_VERSIONS:
+        for name, fields in SAMPLES.items():
+            channel = Channel(LoopbackSocket(), version)
+            channel.send(fields)
+            # Byte-at-a-time reads check that split frames are reassembled
+            received = []
+            while channel.sock.data:
+                received += channel.receive(1)
+            decoded = [(kind, {key: plain(value) for key, value in values.items()})
+                       for kind, values in received]
+            assert decoded == [(name, fields)], f"v{version} {name}: {decoded}"
+
+    # A malformed body costs at most that one message; the stream carries on after it
+    for name in TYPES_BY_NAME:
+        channel = Channel(LoopbackSocket(), 2)
+        body = b"\x01\x00\x00\x00\xff"
+        channel.sock.data = FRAME_HEADER.pack(TYPES_BY_NAME[name].type_id, len(body)) + body
+        channel.sock.data += encode_frames(SAMPLES["paddle"])
+        received = channel.receive()
+        assert len(received) == 2 and received[1] == ("paddle", SAMPLES["paddle"]), f"{name}: {received}"
+    print(f"{len(SAMPLES)} message types round-trip over versions {PROTOCOL_VERSIONS}")
+
+
+if __name__ == "__main__":
+    main()